@@ -0,0 +1,60 @@
+import time
+from operator import attrgetter
+from settings import *
+
+
+class AIScheduler:
+    """
+    Spreads NPC path queries across ticks under a per-tick time budget. Headless games, which the
+    benchmark and the replayable sessions run, use a fixed number of queries per tick instead
+    """
+    def __init__(self, game):
+        self.game = game
+        self.thinks = 0
+        self.deferred = 0
+
+    @staticmethod
+    def get_interval(npc):
+        if npc.ray_cast_value or npc.player_search_trigger:
+            return AI_NEAR_INTERVAL if npc.dist < AI_NEAR_DIST else AI_FAR_INTERVAL
+        return AI_IDLE_INTERVAL
+
+    def think(self, npcs, time_now, deadline=None):
+        """Path queries for npcs in order until the deadline passes, returns how many ran"""
+        thought = 0
+        for npc in npcs:
+            npc.think()
+            npc.next_think_time = time_now + self.get_interval(npc)
+            thought += 1
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        return thought
+
+    def update(self, npc_list):
+        # the angle and distance to the player are cheap and needed by everyone
+        for npc in npc_list:
+            npc.check_animation_time()
+            npc.locate()
+
+        # line of sight for every live NPC in one batched raycast
+        alive = [npc for npc in npc_list if npc.alive]
+        if alive:
+            visible, _ = self.game.raycasting.line_of_sight([npc.theta for npc in alive],
+                                                            [npc.map_pos for npc in alive])
+            for npc, ray_cast_value in zip(alive, visible.tolist()):
+                npc.ray_cast_value = ray_cast_value
+
+        time_now = self.game.time
+        # most overdue first, so NPCs cut off by the budget go early next tick
+        due = sorted((npc for npc in alive if npc.next_think_time <= time_now),
+                     key=attrgetter('next_think_time'))
+        if self.game.headless:
+            thought = self.think(due[:AI_THINKS_PER_TICK], time_now)
+        else:
+            thought = self.think(due, time_now, time.perf_counter() + AI_FRAME_BUDGET_MS / 1000)
+        self.thinks += thought
+        self.deferred += len(due) - thought
+
+        # animation, movement along the last step, attacks and deaths still run every tick
+        for npc in npc_list:
+            npc.run_logic()
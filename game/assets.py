@@ -0,0 +1,105 @@
+import pygame as pg
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from settings import *
+
+
+class AssetRegistry:
+    """Loads and converts every image and animation folder once, then hands out the shared surfaces"""
+    def __init__(self):
+        self.images = {}
+        self.animations = {}
+        self.sounds = {}
+        self.music_data = {}
+        self.timings = {}
+
+    def image(self, path):
+        path = os.path.normpath(path)
+        image = self.images.get(path)
+        if image is None:
+            image = self.images[path] = pg.image.load(path).convert_alpha()
+        return image
+
+    def animation(self, path):
+        path = os.path.normpath(path)
+        frames = self.animations.get(path)
+        if frames is None:
+            frames = self.animations[path] = tuple(
+                self.image(os.path.join(path, file_name)) for file_name in os.listdir(path)
+                if os.path.isfile(os.path.join(path, file_name))
+            )
+        return frames
+
+    def sound(self, path):
+        path = os.path.normpath(path)
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = self.sounds[path] = pg.mixer.Sound(path)
+        return sound
+
+    def music(self, path):
+        """File object for pg.mixer.music.load, read from memory when the track was preloaded"""
+        data = self.music_data.get(os.path.normpath(path))
+        return io.BytesIO(data) if data is not None else path
+
+    @staticmethod
+    def get_category(path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.png':
+            return 'textures' if 'textures' in path.split(os.sep) else 'sprites'
+        if extension == '.wav':
+            return 'sounds'
+        if extension == '.mp3':
+            return 'music'
+        return None
+
+    @staticmethod
+    def decode(path, category):
+        start = time.perf_counter()
+        if category == 'music':
+            with open(path, 'rb') as file:
+                asset = file.read()
+        elif category == 'sounds':
+            asset = pg.mixer.Sound(path)
+        else:
+            asset = pg.image.load(path)
+        return asset, time.perf_counter() - start
+
+    def preload(self, root='resources', on_progress=None, workers=PRELOAD_WORKERS):
+        """Decode every asset under root in a thread pool, surfaces are converted on the calling thread"""
+        if not pg.mixer.get_init():
+            pg.mixer.init()
+        jobs = []
+        for folder, _, file_names in os.walk(root):
+            for file_name in sorted(file_names):
+                path = os.path.normpath(os.path.join(folder, file_name))
+                category = self.get_category(path)
+                if category and path not in self.images and path not in self.sounds and path not in self.music_data:
+                    jobs.append((path, category))
+
+        # per category seconds are summed over worker threads, 'total' is the wall clock time
+        self.timings = {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.decode, path, category): (path, category) for path, category in jobs}
+            for done, future in enumerate(as_completed(futures), 1):
+                path, category = futures[future]
+                asset, seconds = future.result()
+                convert_start = time.perf_counter()
+                if category == 'music':
+                    self.music_data[path] = asset
+                elif category == 'sounds':
+                    self.sounds[path] = asset
+                else:
+                    self.images[path] = asset.convert_alpha()
+                seconds += time.perf_counter() - convert_start
+                self.timings[category] = self.timings.get(category, 0) + seconds
+                if on_progress:
+                    on_progress(done, len(jobs))
+        self.timings['total'] = time.perf_counter() - start
+        return self.timings
+
+
+assets = AssetRegistry()
@@ -0,0 +1,175 @@
+import sys
+import csv
+import json
+import math
+import time
+import random
+import argparse
+import numpy as np
+import pygame as pg
+from settings import *
+
+# tour of the level through open tiles of mini_map
+WAYPOINTS = [(1.5, 1.5), (13.5, 1.5), (13.5, 6.5), (10.5, 6.5), (10.5, 13.5), (4.5, 13.5),
+             (4.5, 25.5), (13.5, 25.5), (13.5, 29.5), (2.5, 29.5)]
+
+
+def tour(t):
+    """Walk the waypoints at constant speed, looking where the path goes"""
+    lengths = [math.dist(a, b) for a, b in zip(WAYPOINTS, WAYPOINTS[1:])]
+    distance = t * sum(lengths)
+    for (x0, y0), (x1, y1), length in zip(WAYPOINTS, WAYPOINTS[1:], lengths):
+        angle = math.atan2(y1 - y0, x1 - x0) % math.tau
+        if distance <= length:
+            return x0 + (x1 - x0) * distance / length, y0 + (y1 - y0) * distance / length, angle
+        distance -= length
+    return x1, y1, angle
+
+
+def spin(t):
+    """Two full turns on the spot in the middle of the big room, every wall texture at every distance"""
+    return 8.5, 27.5, 2 * math.tau * t % math.tau
+
+
+def arena(t):
+    """Circle the big room facing its centre, where most of the NPCs end up"""
+    angle = math.tau * t
+    x, y = 8.5 + 4.5 * math.cos(angle), 27.5 + 1.5 * math.sin(angle)
+    return x, y, (angle + math.pi) % math.tau
+
+
+PATHS = {'tour': tour, 'spin': spin, 'arena': arena}
+STAGES = ('simulate', 'raycast', 'walls', 'sprites', 'background', 'objects', 'hud', 'flip')
+PERCENTILES = (50, 90, 95, 99)
+
+
+def get_stages(game):
+    """One frame of Game.update and Game.draw split into separately timed steps, in the order the game runs them"""
+    def draw_hud():
+        game.object_renderer.draw_player_health()
+        game.object_renderer.draw_player_score()
+        game.weapon.draw()
+        game.draw_hand_status()
+
+    return {
+        'simulate': lambda: game.tick(SIM_DT),
+        'raycast': game.raycasting.ray_cast,
+        'walls': game.raycasting.prepare_objects,
+        'sprites': game.object_handler.get_sprites,
+        'background': game.object_renderer.draw_background,
+        'objects': game.object_renderer.render_game_objects,
+        'hud': draw_hud,
+        'flip': pg.display.flip,
+    }
+
+
+def run(path='tour', frames=600, seed=1, warmup=30):
+    """Per-frame stage timings in ms for the player moved along a scripted path, warmup frames not included"""
+    from main import Game
+    from headless import ScriptedInput
+
+    # spawn_npc and the NPC attacks draw from the global generator
+    random.seed(seed)
+    game = Game(headless=True, input_source=ScriptedInput())
+    stages = get_stages(game)
+    camera_path = PATHS[path]
+
+    timings = {stage: [] for stage in STAGES}
+    for frame in range(warmup + frames):
+        player = game.player
+        player.x, player.y, player.angle = camera_path(max(frame - warmup, 0) / frames)
+        player.store_pose()
+        for stage in STAGES:
+            start = time.perf_counter()
+            stages[stage]()
+            if frame >= warmup:
+                timings[stage].append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    summary = {}
+    totals = np.sum([timings[stage] for stage in STAGES], axis=0)
+    for stage, values in list(timings.items()) + [('frame', totals)]:
+        values = np.asarray(values)
+        summary[stage] = {'mean': float(values.mean()), 'max': float(values.max())}
+        summary[stage].update({f'p{q}': float(np.percentile(values, q)) for q in PERCENTILES})
+    return summary
+
+
+def get_config(args):
+    # anything that changes what is measured, two reports are only comparable when this matches
+    return {
+        'path': args.path, 'frames': args.frames, 'seed': args.seed, 'warmup': args.warmup,
+        'res': RES, 'num_rays': NUM_RAYS, 'wall_render_mode': WALL_RENDER_MODE,
+        'pathfinding_mode': PATHFINDING_MODE, 'ai_scheduler': AI_SCHEDULER,
+        'ai_thinks_per_tick': AI_THINKS_PER_TICK, 'sim_rate': SIM_RATE,
+    }
+
+
+def write_csv(file_name, timings):
+    with open(file_name, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('frame',) + STAGES + ('total',))
+        for frame, row in enumerate(zip(*(timings[stage] for stage in STAGES))):
+            writer.writerow((frame,) + tuple(f'{value:.4f}' for value in row) + (f'{sum(row):.4f}',))
+
+
+def print_summary(summary):
+    print(f'{"stage":<12}{"mean":>8}' + ''.join(f'{"p" + str(q):>8}' for q in PERCENTILES) + f'{"max":>8}')
+    for stage, stats in summary.items():
+        print(f'{stage:<12}{stats["mean"]:>8.2f}' + ''.join(f'{stats[f"p{q}"]:>8.2f}' for q in PERCENTILES)
+              + f'{stats["max"]:>8.2f}')
+
+
+def compare(baseline_file, current_file, percentile=95, threshold=10.0):
+    """Per stage change of one percentile between two reports, True if no stage got more than threshold % slower"""
+    with open(baseline_file) as file:
+        baseline = json.load(file)
+    with open(current_file) as file:
+        current = json.load(file)
+    if baseline['config'] != current['config']:
+        print('warning: the reports were made with different configs')
+
+    key = f'p{percentile}'
+    passed = True
+    print(f'{"stage":<12}{"baseline":>10}{"current":>10}{"change":>9}')
+    for stage, stats in current['summary'].items():
+        before, after = baseline['summary'][stage][key], stats[key]
+        change = (after - before) / before * 100 if before else 0.0
+        # differences under 0.05 ms are timer noise on the cheap stages
+        regressed = change > threshold and after - before > 0.05
+        passed &= not regressed
+        print(f'{stage:<12}{before:>10.2f}{after:>10.2f}{change:>8.1f}%' + ('  REGRESSED' if regressed else ''))
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Frame time benchmark along scripted camera paths')
+    parser.add_argument('--path', choices=PATHS, default='tour')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--json', help='write the config and percentile summary here')
+    parser.add_argument('--csv', help='write the per-frame stage timings here')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='compare two JSON reports instead of running, exits 1 on a regression')
+    parser.add_argument('--percentile', type=int, default=95, choices=PERCENTILES)
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed slowdown in percent')
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(0 if compare(*args.compare, args.percentile, args.threshold) else 1)
+
+    timings = run(args.path, args.frames, args.seed, args.warmup)
+    summary = summarize(timings)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'config': get_config(args), 'summary': summary}, file, indent=2)
+    if args.csv:
+        write_csv(args.csv, timings)
+
+
+if __name__ == '__main__':
+    main()
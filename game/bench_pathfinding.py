@@ -0,0 +1,39 @@
+import sys
+import time
+from random import Random
+from types import SimpleNamespace
+from map import Map
+from pathfinding import PathFinding
+from spatial_hash import SpatialHash
+
+
+def benchmark(mode, queries):
+    game = SimpleNamespace()
+    game.map = Map(game)
+    game.object_handler = SimpleNamespace(npc_positions=SpatialHash(), occupancy_epoch=0)
+    pathfinding = PathFinding(game)
+    pathfinding.mode = mode
+
+    start_time = time.perf_counter()
+    for start, goal in queries:
+        pathfinding.search_path(start, goal)
+    elapsed = time.perf_counter() - start_time
+    return pathfinding.expansions / len(queries), elapsed / len(queries) * 1e6
+
+
+def main(num_queries=2000, seed=1):
+    """Expansions and microseconds per uncached query between random free tiles of mini_map"""
+    game = SimpleNamespace()
+    free_tiles = [(x, y) for y, row in enumerate(Map(game).mini_map) for x, value in enumerate(row) if not value]
+    rng = Random(seed)
+    queries = [(rng.choice(free_tiles), rng.choice(free_tiles)) for _ in range(num_queries)]
+
+    print(f'{num_queries} queries on mini_map ({len(free_tiles)} free tiles)')
+    print(f'{"mode":<8}{"expansions":>12}{"us/query":>12}')
+    for mode in ('bfs', 'astar'):
+        expansions, micros = benchmark(mode, queries)
+        print(f'{mode:<8}{expansions:>12.1f}{micros:>12.1f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -3,7 +3,10 @@ import pyautogui
 import sys
 import os
 import time
+import threading
 import pygame as pg
+from settings import *
+from hand_state import HandSnapshot, NO_HANDS
 
 # Add hand-tracking folder to Python path
 sys.path.append(os.path.abspath('../hand-tracking'))
@@ -12,6 +15,15 @@ from cvzone.HandTrackingModule import HandDetector
 class DualHandController:
     def __init__(self):
         self.cap = cv2.VideoCapture(0)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
+        self.cap.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
+        # some drivers report 0 or nonsense, those get the rate that was asked for
+        camera_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1 / (camera_fps if 1 <= camera_fps <= 240 else CAPTURE_FPS)
+        # size of the last frame, read from the frame itself instead of asking the driver every time
+        self.frame_w = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH) or CAPTURE_WIDTH
+        self.frame_h = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or CAPTURE_HEIGHT
         self.detector = HandDetector(maxHands=2, detectionCon=0.7, modelComplexity=0, minTrackCon=0.7)
         self.screen_width, self.screen_height = pyautogui.size()
         
@@ -41,6 +53,17 @@ class DualHandController:
         
         # Debugging
         self.debug_mode = True
+
+        # the attributes above are the tracker's working state, readers only ever see whole snapshots
+        self.camera_total = 0.0
+        self.snapshot = NO_HANDS
+
+        # (x, y, w, h) of the frame region both hands were last found in, None detects on the whole frame
+        self.roi = None
+        self.roi_detections = 0
+
+        self.stop_event = threading.Event()
+        self.thread = None
         
     def detect_finger_bend(self, hand, finger_index):
         """
@@ -103,9 +126,8 @@ class DualHandController:
         lmList = hand['lmList']
 
         # Get index finger tip position for camera control
-        frame_h, frame_w = self.cap.get(4), self.cap.get(3)
-        index_x = int((lmList[8][0] / frame_w) * self.screen_width)
-        index_y = int((lmList[8][1] / frame_h) * self.screen_height)
+        index_x = int((lmList[8][0] / self.frame_w) * self.screen_width)
+        index_y = int((lmList[8][1] / self.frame_h) * self.screen_height)
         self.right_hand_coords = (index_x, index_y)
 
         # Check for gun gesture (thumb and index up, others down)
@@ -199,46 +221,157 @@ class DualHandController:
         
         return movement
     
-    def run(self):
-        """Main loop for hand detection"""
-        while True:
-            ret, frame = self.cap.read()
+    def poll(self):
+        """Latest published snapshot"""
+        return self.snapshot
+
+    def start(self):
+        """Run the tracker in a daemon thread of this process"""
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self, on_frame=None, stop_event=None):
+        """
+        Main loop for hand detection, on_frame(snapshot) is called after every processed camera frame.
+        Runs until stop_event, or the controller's own one, is set
+        """
+        if stop_event is not None:
+            self.stop_event = stop_event
+        stop_event = self.stop_event
+        interval = 1 / HAND_DETECTION_RATE if HAND_DETECTION_RATE else 0
+        # half a camera frame of slack, so jitter in the frame times doesn't drop every other frame
+        slack = 0.5 * self.frame_interval
+        next_detection = 0
+        next_grab = 0
+        retry_delay = CAPTURE_RETRY_DELAY
+        while not stop_event.is_set():
+            # a camera blocks in grab() until its next frame, this only holds back drivers that return at once
+            now = time.monotonic()
+            if now < next_grab:
+                stop_event.wait(next_grab - now)
+                continue
+            next_grab = now + slack
+
+            if not self.cap.grab():
+                # missing or unplugged camera, wait instead of spinning and back off while it stays away
+                stop_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, CAPTURE_RETRY_MAX)
+                continue
+            retry_delay = CAPTURE_RETRY_DELAY
+            timestamp = time.monotonic()
+            if timestamp < next_detection - slack:
+                continue
+            ret, frame = self.cap.retrieve()
             if not ret:
                 continue
+            next_detection = max(next_detection + interval, timestamp)
+
+            self.process_frame(frame, timestamp)
+            if on_frame:
+                on_frame(self.snapshot)
+
+    def detect(self, frame):
+        """
+        Hands in the frame, landmarks in frame coordinates. Only the region of interest is searched while
+        both hands are being tracked, a hand lost there falls back to the whole frame straight away
+        """
+        if self.roi is not None and self.roi_detections < HAND_ROI_REFRESH:
+            self.roi_detections += 1
+            hands = self.detect_roi(frame, *self.roi)
+            if len(hands) == 2:
+                self.roi = self.get_roi(hands, frame.shape)
+                return hands
+
+        self.roi_detections = 0
+        hands, _ = self.detector.findHands(frame, draw=self.debug_mode)
+        self.roi = self.get_roi(hands, frame.shape) if HAND_ROI_TRACKING and len(hands) == 2 else None
+        return hands
+
+    def detect_roi(self, frame, x, y, w, h):
+        crop = frame[y:y + h, x:x + w]
+        scale = min(1.0, HAND_ROI_WIDTH / w)
+        if scale < 1:
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        hands, _ = self.detector.findHands(crop, draw=False)
+
+        # back to frame coordinates, the gesture checks compare landmarks against each other and don't mind
+        for hand in hands:
+            hand['lmList'] = [[round(lx / scale) + x, round(ly / scale) + y, round(lz / scale)]
+                              for lx, ly, lz in hand['lmList']]
+            bx, by, bw, bh = hand['bbox']
+            hand['bbox'] = round(bx / scale) + x, round(by / scale) + y, round(bw / scale), round(bh / scale)
+            cx, cy = hand['center']
+            hand['center'] = round(cx / scale) + x, round(cy / scale) + y
+        return hands
+
+    def get_roi(self, hands, shape):
+        """Padded box around all the hands, None if it would be most of the frame anyway"""
+        left = min(hand['bbox'][0] for hand in hands)
+        top = min(hand['bbox'][1] for hand in hands)
+        right = max(hand['bbox'][0] + hand['bbox'][2] for hand in hands)
+        bottom = max(hand['bbox'][1] + hand['bbox'][3] for hand in hands)
+        pad = int(HAND_ROI_PADDING * max(right - left, bottom - top))
+
+        frame_h, frame_w = shape[:2]
+        left, top = max(0, left - pad), max(0, top - pad)
+        right, bottom = min(frame_w, right + pad), min(frame_h, bottom + pad)
+        if (right - left) * (bottom - top) > 0.75 * frame_w * frame_h:
+            return None
+        return left, top, right - left, bottom - top
+
+    def process_frame(self, frame, timestamp):
+        """Work out the gesture state of one camera frame and publish it as a new snapshot"""
+        self.frame_h, self.frame_w = frame.shape[:2]
+        hands = self.detect(frame)
+        detect_time = time.monotonic()
+        
+        # Reset states (except weapon_switch which has its own logic)
+        self.left_hand_present = False
+        self.move_forward = False
+        self.move_left = False
+        self.move_backward = False
+        self.move_right = False
+        self.gun_flag = False
+        self.weapon_flag = False
+        self.right_hand_coords = None
+        
+        if hands:
+            for hand in hands:
+                hand_type = hand['type']
                 
-            hands, frame = self.detector.findHands(frame, draw=self.debug_mode)
-            
-            # Reset states (except weapon_switch which has its own logic)
-            self.left_hand_present = False
-            self.move_forward = False
-            self.move_left = False
-            self.move_backward = False
-            self.move_right = False
-            self.gun_flag = False
-            self.weapon_flag = False
-            self.right_hand_coords = None
-            
-            if hands:
-                for hand in hands:
-                    hand_type = hand['type']
-                    
-                    if hand_type == 'Left':
-                        self.process_left_hand(hand)
-                    elif hand_type == 'Right':
-                        self.process_right_hand(hand)
-            else:
-                # No hands detected, reset weapon switch
-                self.weapon_switch = False
-                self.weapon_gesture_detected = False
-            
-            # # Display debug window
-            # if self.debug_mode:
-            #     cv2.imshow("Hand Tracking Debug", frame)
-            #     if cv2.waitKey(1) & 0xFF == ord('q'):
-            #         break
+                if hand_type == 'Left':
+                    self.process_left_hand(hand)
+                elif hand_type == 'Right':
+                    self.process_right_hand(hand)
+        else:
+            # No hands detected, reset weapon switch
+            self.weapon_switch = False
+            self.weapon_gesture_detected = False
+
+        self.camera_total += self.get_camera_movement()
+        # a single reference swap, the game never sees a half updated state
+        self.snapshot = HandSnapshot(
+            timestamp, detect_time, time.monotonic(), self.left_hand_present, self.move_forward, self.move_backward, self.move_left,
+            self.move_right, self.weapon_switch, self.gun_flag, self.weapon_flag, self.right_hand_coords,
+            self.camera_total,
+        )
+        
+        # # Display debug window
+        # if self.debug_mode:
+        #     cv2.imshow("Hand Tracking Debug", frame)
+        #     if cv2.waitKey(1) & 0xFF == ord('q'):
+        #         return
     
     def cleanup(self):
-        """Clean up resources"""
+        """Stop the tracker thread, then release the camera it reads from"""
+        self.stop_event.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            # long enough for a slow findHands, but a stuck driver must not hang the game's exit
+            self.thread.join(timeout=3)
+            if self.thread.is_alive():
+                # it may still be in grab() or findHands, the capture goes away with the process instead
+                print("Hand tracker thread did not stop, leaving the camera to the process exit")
+                return
         self.cap.release()
         cv2.destroyAllWindows()
 
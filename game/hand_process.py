@@ -0,0 +1,95 @@
+import math
+import time
+import struct
+import ctypes
+import multiprocessing as mp
+from hand_state import HandSnapshot, FLAGS, NO_HANDS
+
+# sequence number, then the capture, detect and publish times, flags packed one bit each,
+# right hand x and y (nan when no right hand) and camera turn so far
+SEQUENCE = struct.Struct('<Q')
+PAYLOAD = struct.Struct('<dddIddd')
+BLOCK_SIZE = SEQUENCE.size + PAYLOAD.size
+
+
+class HandStateBlock:
+    """
+    Fixed layout hand state record in shared memory, guarded by a seqlock.
+    One writer makes the sequence number odd, writes the payload and makes it even again,
+    readers retry until they see the same even number before and after reading the payload
+    """
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.seq = 0
+
+    def write(self, snapshot):
+        flags = 0
+        for bit, name in enumerate(FLAGS):
+            if getattr(snapshot, name):
+                flags |= 1 << bit
+        right_x, right_y = snapshot.right_hand_coords or (math.nan, math.nan)
+
+        SEQUENCE.pack_into(self.buffer, 0, self.seq + 1)
+        PAYLOAD.pack_into(self.buffer, SEQUENCE.size, snapshot.timestamp, snapshot.detect_time, snapshot.publish_time,
+                          flags, right_x, right_y, snapshot.camera_total)
+        self.seq += 2
+        SEQUENCE.pack_into(self.buffer, 0, self.seq)
+
+    def read(self):
+        """(sequence number, payload) of the last complete write"""
+        while True:
+            seq, = SEQUENCE.unpack_from(self.buffer, 0)
+            if not seq & 1:
+                payload = PAYLOAD.unpack_from(self.buffer, SEQUENCE.size)
+                if SEQUENCE.unpack_from(self.buffer, 0)[0] == seq:
+                    return seq, payload
+            # the writer is mid-update, let it finish
+            time.sleep(0)
+
+
+def run_tracker(buffer, stop_event):
+    """Entry point of the tracker process, publishes every snapshot the controller makes"""
+    from dual_hand_mouse import DualHandController
+
+    block = HandStateBlock(buffer)
+    controller = DualHandController()
+    try:
+        controller.run(on_frame=block.write, stop_event=stop_event)
+    finally:
+        controller.cleanup()
+
+
+class HandTrackerProcess:
+    """
+    Game side of the hand tracker when it runs in its own process, so capture and inference never hold the GIL
+    of the renderer. poll() hands out snapshots just like DualHandController
+    """
+    def __init__(self):
+        # spawn, not fork, the game process already has SDL and its threads running
+        context = mp.get_context('spawn')
+        self.buffer = context.RawArray(ctypes.c_char, BLOCK_SIZE)
+        self.block = HandStateBlock(self.buffer)
+        self.stop_event = context.Event()
+        self.process = context.Process(target=run_tracker, args=(self.buffer, self.stop_event), daemon=True)
+
+        self.seq = 0
+        self.snapshot = NO_HANDS
+
+    def start(self):
+        self.process.start()
+
+    def poll(self):
+        """Snapshot of the latest complete record, the same object again until the tracker publishes a new one"""
+        seq, (timestamp, detect_time, publish_time, flags, right_x, right_y, camera_total) = self.block.read()
+        if seq != self.seq:
+            self.seq = seq
+            right_hand_coords = None if math.isnan(right_x) else (int(right_x), int(right_y))
+            self.snapshot = HandSnapshot(timestamp, detect_time, publish_time, *(bool(flags >> bit & 1) for bit in range(len(FLAGS))),
+                                         right_hand_coords, camera_total)
+        return self.snapshot
+
+    def cleanup(self):
+        self.stop_event.set()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
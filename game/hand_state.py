@@ -0,0 +1,14 @@
+from collections import namedtuple
+
+# one camera frame worth of gesture state, published whole and never modified afterwards.
+# timestamp, detect_time and publish_time are time.monotonic() when the frame was captured, when findHands
+# was done with it and when the snapshot was published. camera_total is the camera turn summed since start
+HandSnapshot = namedtuple('HandSnapshot', (
+    'timestamp', 'detect_time', 'publish_time', 'left_hand_present', 'move_forward', 'move_backward',
+    'move_left', 'move_right', 'weapon_switch', 'gun_flag', 'weapon_flag', 'right_hand_coords', 'camera_total',
+))
+
+# gesture flags of a snapshot, in field order
+FLAGS = HandSnapshot._fields[3:11]
+
+NO_HANDS = HandSnapshot(0.0, 0.0, 0.0, False, False, False, False, False, False, False, False, None, 0.0)
@@ -0,0 +1,113 @@
+import sys
+import time
+import random
+from multiprocessing import Pool
+from settings import *
+from hand_state import HandSnapshot
+
+
+class ScriptedInput:
+    """Stands in for DualHandController, whoever drives the game sets the gesture state between ticks"""
+    def __init__(self):
+        # both hands always present, so the keyboard and mouse fallbacks stay out of the way
+        self.left_hand_present = True
+        self.right_hand_coords = (HALF_WIDTH, HALF_HEIGHT)
+        self.move_forward = False
+        self.move_backward = False
+        self.move_left = False
+        self.move_right = False
+        self.weapon_switch = False
+        self.gun_flag = False
+        self.turn = 0  # radians per tick
+        self.camera_total = 0.0
+
+    def poll(self):
+        """A new snapshot of the current state every tick, as if the camera ran at the simulation rate"""
+        self.camera_total += self.turn
+        now = time.monotonic()
+        return HandSnapshot(now, now, now, self.left_hand_present, self.move_forward, self.move_backward,
+                            self.move_left, self.move_right, self.weapon_switch, self.gun_flag, False,
+                            self.right_hand_coords, self.camera_total)
+
+    def cleanup(self):
+        pass
+
+
+class RandomInput(ScriptedInput):
+    """Random gestures from its own seeded generator, each held for hold_ticks ticks"""
+    def __init__(self, seed, hold_ticks=30):
+        super().__init__()
+        self.rng = random.Random(seed)
+        self.hold_ticks = hold_ticks
+        self.ticks = 0
+
+    def step(self):
+        if self.ticks % self.hold_ticks == 0:
+            rng = self.rng
+            self.move_forward = rng.random() < 0.6
+            self.move_backward = rng.random() < 0.1
+            self.move_left = rng.random() < 0.2
+            self.move_right = rng.random() < 0.2
+            self.gun_flag = rng.random() < 0.4
+            self.turn = rng.uniform(-0.04, 0.04)
+        self.ticks += 1
+
+
+def run_session(seed=1, ticks=3600, render_every=0):
+    """
+    One headless game driven by RandomInput for a number of fixed ticks, a frame is raycast and drawn
+    off-screen every render_every ticks (0 for none). Returns a summary of the run
+    """
+    from main import Game
+
+    # the spawns and NPC attacks use the global generator
+    random.seed(seed)
+    controls = RandomInput(seed)
+    game = Game(headless=True, input_source=controls)
+
+    slowest = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        controls.step()
+        tick_start = time.perf_counter()
+        game.tick(SIM_DT)
+        slowest = max(slowest, time.perf_counter() - tick_start)
+        if render_every and tick % render_every == 0:
+            game.prepare_frame()
+            game.draw()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'seed': seed,
+        'ticks': ticks,
+        'sim_seconds': game.time / 1000,
+        'wall_seconds': elapsed,
+        'max_tick_ms': slowest * 1000,
+        'rounds': game.rounds,
+        'score': game.player.score,
+        'health': game.player.health,
+        'npcs_alive': sum(npc.alive for npc in game.object_handler.npc_list),
+    }
+
+
+def main(sessions=1, ticks=3600, seed=1, render_every=0):
+    """Run sessions headless games with consecutive seeds, one per process"""
+    jobs = [(seed + session, ticks, render_every) for session in range(sessions)]
+    if sessions == 1:
+        results = [run_session(*jobs[0])]
+    else:
+        with Pool(sessions) as pool:
+            results = pool.starmap(run_session, jobs)
+            # SDL turns SIGTERM into a quit event, so let the workers finish instead of terminating them
+            pool.close()
+            pool.join()
+
+    print(f'{"seed":>6}{"rounds":>8}{"score":>8}{"alive":>7}{"ms/tick":>9}{"max ms":>8}{"x real":>8}')
+    for result in results:
+        print(f'{result["seed"]:>6}{result["rounds"]:>8}{result["score"]:>8}{result["npcs_alive"]:>7}'
+              f'{result["wall_seconds"] / result["ticks"] * 1000:>9.2f}{result["max_tick_ms"]:>8.1f}'
+              f'{result["sim_seconds"] / result["wall_seconds"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,82 @@
+import csv
+import time
+import numpy as np
+import pygame as pg
+from settings import *
+
+# time.monotonic() points every camera frame passes on its way to the screen
+POINTS = ('capture', 'detect', 'publish', 'consume', 'display')
+# the stage between each point and the next, plus the whole way through
+STAGES = ('detect', 'classify', 'handoff', 'frame', 'total')
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyMonitor:
+    """
+    Camera to screen latency of the hand input. The points of the last LATENCY_SAMPLES camera frames
+    the game acted on are kept in a ring buffer:
+    capture - cap.read() returned, detect - findHands done, publish - gestures classified and the snapshot
+    published, consume - first tick that used the snapshot, display - flip of the frame drawn after that tick
+    """
+    def __init__(self, size=LATENCY_SAMPLES):
+        self.points = np.zeros((size, len(POINTS)))
+        self.count = 0
+        # consumed this frame, waiting for the flip
+        self.pending = []
+        self.show = LATENCY_OVERLAY
+        self.font = None
+
+    def consume(self, snapshot):
+        # nothing to measure before the tracker published anything
+        if snapshot.timestamp:
+            self.pending.append((snapshot.timestamp, snapshot.detect_time, snapshot.publish_time, time.monotonic()))
+
+    def displayed(self):
+        if not self.pending:
+            return
+        now = time.monotonic()
+        for points in self.pending:
+            self.points[self.count % len(self.points)] = points + (now,)
+            self.count += 1
+        self.pending.clear()
+
+    def kept_points(self):
+        """Points of the kept camera frames, oldest first"""
+        size = len(self.points)
+        if self.count <= size:
+            return self.points[:self.count]
+        return np.roll(self.points, -(self.count % size), axis=0)
+
+    def stage_times(self, points):
+        """ms spent in each stage for rows of points"""
+        stages = np.diff(points, axis=1)
+        total = points[:, -1:] - points[:, :1]
+        return np.hstack((stages, total)) * 1000
+
+    def percentiles(self):
+        """{stage: {'p50': ms, ...}}, empty until a camera frame made it to the screen"""
+        if not self.count:
+            return {}
+        values = np.percentile(self.stage_times(self.kept_points()), PERCENTILES, axis=0)
+        return {stage: {f'p{q}': float(value) for q, value in zip(PERCENTILES, values[:, column])}
+                for column, stage in enumerate(STAGES)}
+
+    def draw(self, screen, x, y):
+        if self.font is None:
+            self.font = pg.font.Font(None, 24)
+        lines = [f'{"LATENCY MS":<10}' + ''.join(f'{"P" + str(q):>7}' for q in PERCENTILES)]
+        for stage, stats in self.percentiles().items():
+            lines.append(f'{stage.upper():<10}' + ''.join(f'{stats[f"p{q}"]:>7.1f}' for q in PERCENTILES))
+        if len(lines) == 1:
+            lines.append('NO CAMERA FRAMES YET')
+        for line in lines:
+            screen.blit(self.font.render(line, True, (255, 255, 0)), (x, y))
+            y += 20
+
+    def write_log(self, file_name):
+        with open(file_name, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(POINTS + tuple(f'{stage}_ms' for stage in STAGES))
+            points = self.kept_points()
+            for row, stages in zip(points, self.stage_times(points)):
+                writer.writerow(tuple(f'{point:.6f}' for point in row) + tuple(f'{ms:.3f}' for ms in stages))
@@ -1,7 +1,6 @@
 import pygame as pg
 import sys
 import os
-import threading
 from settings import *
 from map import *
 from player import *
@@ -12,32 +11,91 @@ from object_handler import *
 from weapon import *
 from sound import *
 from pathfinding import *
-from dual_hand_mouse import DualHandController  # Import the new dual hand controller
 from pause_menu import PauseMenu
+from hand_state import NO_HANDS
+from latency import LatencyMonitor
+from assets import assets
 
-sys.path.append(os.path.abspath('..'))
-from cvzone.HandTrackingModule import HandDetector
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, input_source=None):
+        """
+        headless runs on SDL's dummy video and audio drivers, with no window, camera or blocking end screens.
+        input_source replaces the hand tracker, anything whose poll() returns a HandSnapshot and that has
+        a cleanup() method will do
+        """
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         pg.init()
         pg.mouse.set_visible(False)
         self.screen = pg.display.set_mode(RES)
         pg.event.set_grab(True)
         self.clock = pg.time.Clock()
         self.delta_time = 1
+        # simulation clock in ms, everything that plays out over time reads this instead of get_ticks
+        self.time = 0
+        # ms of real time not simulated yet, and how far the drawn frame is between the last two ticks
+        self.accumulator = 0
+        self.alpha = 1.0
         self.global_trigger = False
-        self.global_event = pg.USEREVENT + 0
-        pg.time.set_timer(self.global_event, 40)
+        self.global_interval = 40
+        self.global_time_prev = 0
+        # screen of a round that ended during the current tick, shown and restarted once the tick is over
+        self.round_end = None
+        # hand input the current tick runs on, one snapshot per tick
+        self.hand = NO_HANDS
+        self.latency = LatencyMonitor()
+
+        if input_source is not None:
+            self.hand_controller = input_source
+        elif headless:
+            from headless import ScriptedInput
+            self.hand_controller = ScriptedInput()
+        else:
+            self.start_hand_tracking()
+
+        self.loading_font = None
+        self.preload_assets()
+        self.new_game()
+
+    def start_hand_tracking(self):
+        if HAND_TRACKING_PROCESS:
+            # capture and inference in their own process, the state comes back through shared memory
+            from hand_process import HandTrackerProcess
+            self.hand_controller = HandTrackerProcess()
+            self.hand_controller.start()
+            return
+
+        # imported here so headless runs need neither a camera nor a display for pyautogui
+        from dual_hand_mouse import DualHandController
 
         # Start the dual hand controller in a separate thread
         self.hand_controller = DualHandController()
-        self.hand_thread = threading.Thread(target=self.hand_controller.run, daemon=True)
-        self.hand_thread.start()
+        self.hand_controller.start()
 
-        self.new_game()
+    def preload_assets(self):
+        timings = assets.preload(on_progress=self.draw_loading_screen)
+        breakdown = ', '.join(f'{category} {seconds:.2f}s' for category, seconds in timings.items()
+                              if category != 'total')
+        print(f"Assets preloaded in {timings['total']:.2f}s ({breakdown})")
+
+    def draw_loading_screen(self, done, total):
+        pg.event.pump()
+        self.screen.fill('black')
+        bar_width, bar_height = WIDTH // 2, 30
+        bar_x, bar_y = WIDTH // 4, HALF_HEIGHT - bar_height // 2
+        pg.draw.rect(self.screen, (150, 0, 0), (bar_x, bar_y, bar_width * done // total, bar_height))
+        pg.draw.rect(self.screen, (255, 50, 0), (bar_x, bar_y, bar_width, bar_height), 2)
+        if self.loading_font is None:
+            self.loading_font = pg.font.Font(None, 48)
+        text_surface = self.loading_font.render(f'LOADING {done * 100 // total}%', True, (255, 50, 0))
+        self.screen.blit(text_surface, text_surface.get_rect(center=(HALF_WIDTH, bar_y - 40)))
+        pg.display.flip()
 
     def new_game(self):
+        self.rounds = 1
         self.map = Map(self)
         self.player = Player(self)
         self.object_renderer = ObjectRenderer(self)
@@ -49,35 +107,117 @@ class Game:
         self.pause_menu = PauseMenu(self)
         pg.mixer.music.play(-1)
 
+    def restart(self):
+        """Start a new round, keeping the loaded assets, map, renderer and path graph"""
+        self.rounds += 1
+        self.player.reset()
+        self.weapon.reset()
+        self.object_handler.reset()
+        self.pathfinding.reset()
+        pg.mixer.music.play(-1)
+
     def update(self):
+        frame_time = self.clock.tick(FPS)
         # Only update game if not paused
         if not self.pause_menu.is_paused:
-            # Right hand gesture → Rotate player view
-            camera_movement = self.hand_controller.get_camera_movement()
-            if camera_movement != 0:
-                self.player.angle -= camera_movement  # Apply camera rotation
-
-            # Right hand gesture → Fire weapon
-            if self.hand_controller.gun_flag:
-                if not self.player.shot and not self.weapon.reloading:
-                    self.player.shot = True
-                    self.weapon.fire()
+            if FIXED_TIMESTEP:
+                self.accumulator += frame_time
+                steps = 0
+                while self.accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+                    self.tick(SIM_DT)
+                    self.accumulator -= SIM_DT
+                    steps += 1
+                if steps == MAX_SIM_STEPS:
+                    # fell behind, e.g. after the game over screen, drop the rest instead of catching up
+                    self.accumulator %= SIM_DT
+                self.alpha = self.accumulator / SIM_DT
             else:
-                self.player.shot = False  # Reset shot flag when gesture ends
+                self.tick(frame_time)
+                self.alpha = 1.0
 
-            # Left hand gestures → Movement and weapon switching
-            self.handle_hand_movement()
+            self.prepare_frame()
+            pg.display.flip()
+        caption = f'{self.clock.get_fps():.1f}'
+        if SHOW_CACHE_STATS:
+            caption += f' | walls {self.raycasting.wall_cache.hit_rate:.0%}'
+            caption += f' | sprites {sprite_cache.hit_rate:.0%} ({sprite_cache.evictions} evicted)'
+            caption += f' | paths {self.pathfinding.path_cache.hit_rate:.0%}'
+            if AI_SCHEDULER:
+                scheduler = self.object_handler.ai_scheduler
+                caption += f' | ai {scheduler.thinks} thinks ({scheduler.deferred} deferred)'
+        pg.display.set_caption(caption)
 
-            self.player.update()
-            self.raycasting.update()
-            self.object_handler.update()
-            self.weapon.update()
-            
+    def prepare_frame(self):
+        """Raycast and project sprites for the frame about to be drawn"""
+        self.raycasting.update()
+        self.object_handler.get_sprites()
+
+    def tick(self, delta_time):
+        """Advance the simulation by delta_time ms"""
+        self.delta_time = delta_time
+        self.time += delta_time
+        self.global_trigger = self.time - self.global_time_prev >= self.global_interval
+        if self.global_trigger:
+            # stepped by the interval rather than set to now, so it fires every global_interval ms on average
+            # even when that is not a whole number of ticks (every 2 or 3 ticks at 60 Hz)
+            self.global_time_prev = max(self.global_time_prev + self.global_interval,
+                                        self.time - self.global_interval)
+        self.player.store_pose()
+        # the same snapshot can come back for several ticks when the camera is slower than the simulation
+        previous, self.hand = self.hand, self.hand_controller.poll()
+        fresh = self.hand is not previous
+        if fresh and not self.headless:
+            self.latency.consume(self.hand)
+
+        # Right hand gesture → Rotate player view
+        camera_movement = self.hand.camera_total - previous.camera_total
+        if camera_movement != 0:
+            self.player.angle -= camera_movement  # Apply camera rotation
+
+        # Right hand gesture → Fire weapon
+        if self.hand.gun_flag:
+            if not self.player.shot and not self.weapon.reloading:
+                self.player.shot = True
+                self.weapon.fire()
+        else:
+            self.player.shot = False  # Reset shot flag when gesture ends
+
+        # Left hand gestures → Movement and weapon switching
+        self.handle_hand_movement(fresh)
+
+        self.player.update()
+        self.object_handler.update()
+        self.weapon.update()
+        if self.round_end:
+            self.finish_round()
+
+    def end_round(self, show_result):
+        """Called when the round is lost or won, the first result of a tick counts"""
+        if self.round_end is None:
+            self.round_end = show_result
+
+    def finish_round(self):
+        """
+        Show how the round ended and start the next one. Runs after the whole tick, so nothing of the
+        old round keeps going after the reset
+        """
+        show_result, self.round_end = self.round_end, None
+        if not self.headless:
+            show_result()
+            self.object_renderer.draw_final_score(self.player.score)
             pg.display.flip()
-        self.delta_time = self.clock.tick(FPS)
-        pg.display.set_caption(f'{self.clock.get_fps():.1f}')
 
-    def handle_hand_movement(self):
+            # Wait for player input to restart
+            waiting = True
+            while waiting:
+                for event in pg.event.get():
+                    if event.type == pg.KEYDOWN:
+                        if event.key == pg.K_RETURN or event.key == pg.K_r:  # Press Enter or R to restart
+                            waiting = False
+                pg.time.delay(100)  # Small delay to avoid CPU overuse
+        self.restart()
+
+    def handle_hand_movement(self, fresh=True):
         """Handle movement and weapon switching based on left hand gestures"""
         # Apply movement based on finger bending
         sin_a = math.sin(self.player.angle)
@@ -90,19 +230,19 @@ class Game:
         num_key_pressed = 0
         
         # Movement controls via left hand finger bending
-        if self.hand_controller.move_forward:  # Thumb bent -> W
+        if self.hand.move_forward:  # Thumb bent -> W
             num_key_pressed += 1
             dx += speed_cos
             dy += speed_sin
-        if self.hand_controller.move_backward:  # Middle finger bent -> S
+        if self.hand.move_backward:  # Middle finger bent -> S
             num_key_pressed += 1
             dx += -speed_cos
             dy += -speed_sin
-        if self.hand_controller.move_left:  # Index finger bent -> A
+        if self.hand.move_left:  # Index finger bent -> A
             num_key_pressed += 1
             dx += speed_sin
             dy += -speed_cos
-        if self.hand_controller.move_right:  # Ring finger bent -> D
+        if self.hand.move_right:  # Ring finger bent -> D
             num_key_pressed += 1
             dx += -speed_sin
             dy += speed_cos
@@ -112,8 +252,8 @@ class Game:
             dx *= self.player.diag_move_corr
             dy *= self.player.diag_move_corr
             
-        # Weapon switching via left hand fist gesture (F key equivalent)
-        if self.hand_controller.weapon_switch:
+        # Weapon switching via left hand fist gesture (F key equivalent), a one camera frame pulse
+        if self.hand.weapon_switch and fresh:
             self.weapon.toggle_weapon()
         
         # Apply movement if there's any
@@ -128,6 +268,8 @@ class Game:
         
         # Draw hand tracking status
         self.draw_hand_status()
+        if self.latency.show:
+            self.latency.draw(self.screen, 0, self.object_renderer.digit_size + 70)
         
         # Apply brightness overlay if needed
         self.pause_menu.apply_brightness(self.screen)
@@ -144,14 +286,14 @@ class Game:
         base_y = self.object_renderer.digit_size + 10  # Below health digits with 10px gap
 
         # Left hand status
-        if self.hand_controller.left_hand_present:
+        if self.hand.left_hand_present:
             left_status = "LEFT HAND: "
             active_controls = []
-            if self.hand_controller.move_forward: active_controls.append("W")
-            if self.hand_controller.move_left: active_controls.append("A")
-            if self.hand_controller.move_backward: active_controls.append("S")
-            if self.hand_controller.move_right: active_controls.append("D")
-            if self.hand_controller.weapon_switch: active_controls.append("1")
+            if self.hand.move_forward: active_controls.append("W")
+            if self.hand.move_left: active_controls.append("A")
+            if self.hand.move_backward: active_controls.append("S")
+            if self.hand.move_right: active_controls.append("D")
+            if self.hand.weapon_switch: active_controls.append("1")
             
             if active_controls:
                 left_status += ", ".join(active_controls)
@@ -166,9 +308,9 @@ class Game:
         
         # Right hand status (below left hand status)
         base_y += 30  # Stack under left hand text
-        if self.hand_controller.right_hand_coords:
+        if self.hand.right_hand_coords:
             right_status = "RIGHT HAND: "
-            if self.hand_controller.gun_flag:
+            if self.hand.gun_flag:
                 right_status += "FIRING"
             else:
                 right_status += "AIMING"
@@ -182,16 +324,13 @@ class Game:
 
 
     def check_events(self):
-        self.global_trigger = False
         for event in pg.event.get():
             if event.type == pg.QUIT:
-                self.hand_controller.cleanup()
-                pg.quit()
-                sys.exit()
+                self.quit()
             elif event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
                 self.pause_menu.toggle_pause()
-            elif event.type == self.global_event:
-                self.global_trigger = True
+            elif event.type == pg.KEYDOWN and event.key == pg.K_F3:
+                self.latency.show = not self.latency.show
                         
             # Handle pause menu events
             self.pause_menu.handle_events(event)
@@ -207,10 +346,17 @@ class Game:
                 self.update()
                 self.draw()
                 pg.display.flip()
+                self.latency.displayed()
         except KeyboardInterrupt:
-            self.hand_controller.cleanup()
-            pg.quit()
-            sys.exit()
+            self.quit()
+
+    def quit(self):
+        self.hand_controller.cleanup()
+        if LATENCY_LOG:
+            self.latency.write_log(LATENCY_LOG)
+            print(f'Hand input latency log written to {LATENCY_LOG}')
+        pg.quit()
+        sys.exit()
 
 if __name__ == '__main__':
     game = Game()
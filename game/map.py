@@ -1,4 +1,5 @@
 import pygame as pg
+import numpy as np
 
 _ = False
 mini_map = [
@@ -44,13 +45,20 @@ class Map:
         self.world_map = {}
         self.rows = len(self.mini_map)
         self.cols = len(self.mini_map[0])
+        self.grid = np.zeros((self.rows, self.cols), dtype=np.uint8)
         self.get_map()
+        # flat row-major copy of the grid for cheap scalar lookups
+        self.cells = self.grid.tobytes()
 
     def get_map(self):
         for j, row in enumerate(self.mini_map):
             for i, value in enumerate(row):
                 if value:
                     self.world_map[(i, j)] = value
+                    self.grid[j, i] = value
+
+    def is_wall(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.cells[y * self.cols + x] > 0
 
     def draw(self):
         [pg.draw.rect(self.game.screen, 'darkgray', (pos[0] * 100, pos[1] * 100, 100, 100), 2)
@@ -13,8 +13,9 @@ class NPC(AnimatedSprite):
         self.walk_images = self.get_images(self.path + '/walk')
 
         self.attack_dist = randint(3, 6)
-        self.speed = 0.03
-        self.size = 20
+        self.speed = 0.003  # tiles per ms
+        # the wall probe reaches speed * size ahead of the NPC, whatever the tick length
+        self.size = 200
         self.health = 100
         self.attack_damage = 10
         self.accuracy = 0.15
@@ -23,31 +24,62 @@ class NPC(AnimatedSprite):
         self.ray_cast_value = False
         self.frame_counter = 0
         self.player_search_trigger = False
+        # tile this NPC is filed under in object_handler.npc_positions
+        self.cell = None
+        # half of the sprite width in world units, what a shot has to pass within
+        self.hit_radius = self.SPRITE_SCALE * self.IMAGE_RATIO / 2
+        # results of the last think, reused by the frames in between when the AI scheduler runs it
+        self.next_pos = None
+        self.next_think_time = 0
 
 
     def update(self):
         self.check_animation_time()
-        self.get_sprite()
+        self.locate()
+        if self.alive:
+            self.ray_cast_value = self.ray_cast_player_npc()
+            self.think()
         self.run_logic()
         # self.draw_ray_cast()
 
+    def think(self):
+        """Expensive part of the AI: the next path step towards the player"""
+        chasing = self.ray_cast_value or self.player_search_trigger
+        in_attack_range = self.ray_cast_value and self.dist < self.attack_dist
+        if chasing and not in_attack_range and not self.pain:
+            self.next_pos = self.game.pathfinding.get_path(self.map_pos, self.game.player.map_pos)
+
     def check_wall(self, x, y):
-        return (x, y) not in self.game.map.world_map
+        return not self.game.map.is_wall(x, y)
 
     def check_wall_collision(self, dx, dy):
-        if self.check_wall(int(self.x + dx * self.size), int(self.y)):
+        scale = self.size / self.game.delta_time
+        if self.check_wall(int(self.x + dx * scale), int(self.y)):
             self.x += dx
-        if self.check_wall(int(self.x), int(self.y + dy * self.size)):
+        if self.check_wall(int(self.x), int(self.y + dy * scale)):
             self.y += dy
+        self.update_cell()
+
+    def update_cell(self):
+        cell = self.map_pos
+        if cell != self.cell:
+            self.game.object_handler.npc_positions.move(self, self.cell, cell)
+            self.cell = cell
 
     def movement(self):
-        next_pos = self.game.pathfinding.get_path(self.map_pos, self.game.player.map_pos)
+        next_pos = self.next_pos
+        if next_pos is None:
+            return
+        if next_pos == self.map_pos:
+            # step reached, ask the scheduler for a fresh one
+            self.next_think_time = 0
         next_x, next_y = next_pos
 
         if next_pos not in self.game.object_handler.npc_positions:
             angle = math.atan2(next_y + 0.5 - self.y, next_x + 0.5 - self.x)
-            dx = math.cos(angle) * self.speed
-            dy = math.sin(angle) * self.speed
+            speed = self.speed * self.game.delta_time
+            dx = math.cos(angle) * speed
+            dy = math.sin(angle) * speed
             self.check_wall_collision(dx, dy)
 
     def attack(self):
@@ -68,32 +100,22 @@ class NPC(AnimatedSprite):
         if self.animation_trigger:
             self.pain = False
 
-    def check_hit_in_npc(self):
-        if self.ray_cast_value and self.game.player.shot:
-            if HALF_WIDTH - self.sprite_half_width < self.screen_x < HALF_WIDTH + self.sprite_half_width:
-                # Check weapon range
-                if self.dist <= self.game.weapon.range:
-                    self.game.sound.npc_pain.play()
-                    self.game.player.shot = False
-                    self.pain = True
-                    self.health -= self.game.weapon.damage
-                    self.check_health()
-                else:
-                    # Out of range - reset shot without dealing damage
-                    self.game.player.shot = False
+    def get_hit(self, damage):
+        self.game.sound.npc_pain.play()
+        self.pain = True
+        self.health -= damage
+        self.check_health()
 
     def check_health(self):
         if self.health < 1 and self.alive:
             self.alive = False
+            self.game.object_handler.npc_positions.remove(self, self.cell)
             self.game.sound.npc_death.play()
             # 🏆 Add score when killed
             self.game.player.add_score(self.kill_score)
 
     def run_logic(self):
         if self.alive:
-            self.ray_cast_value = self.ray_cast_player_npc()
-            self.check_hit_in_npc()
-
             if self.pain:
                 self.animate_pain()
 
@@ -121,68 +143,8 @@ class NPC(AnimatedSprite):
         return int(self.x), int(self.y)
 
     def ray_cast_player_npc(self):
-        if self.game.player.map_pos == self.map_pos:
-            return True
-
-        wall_dist_v, wall_dist_h = 0, 0
-        player_dist_v, player_dist_h = 0, 0
-
-        ox, oy = self.game.player.pos
-        x_map, y_map = self.game.player.map_pos
-
-        ray_angle = self.theta
-
-        sin_a = math.sin(ray_angle)
-        cos_a = math.cos(ray_angle)
-
-        # horizontals
-        y_hor, dy = (y_map + 1, 1) if sin_a > 0 else (y_map - 1e-6, -1)
-
-        depth_hor = (y_hor - oy) / sin_a
-        x_hor = ox + depth_hor * cos_a
-
-        delta_depth = dy / sin_a
-        dx = delta_depth * cos_a
-
-        for i in range(MAX_DEPTH):
-            tile_hor = int(x_hor), int(y_hor)
-            if tile_hor == self.map_pos:
-                player_dist_h = depth_hor
-                break
-            if tile_hor in self.game.map.world_map:
-                wall_dist_h = depth_hor
-                break
-            x_hor += dx
-            y_hor += dy
-            depth_hor += delta_depth
-
-        # verticals
-        x_vert, dx = (x_map + 1, 1) if cos_a > 0 else (x_map - 1e-6, -1)
-
-        depth_vert = (x_vert - ox) / cos_a
-        y_vert = oy + depth_vert * sin_a
-
-        delta_depth = dx / cos_a
-        dy = delta_depth * sin_a
-
-        for i in range(MAX_DEPTH):
-            tile_vert = int(x_vert), int(y_vert)
-            if tile_vert == self.map_pos:
-                player_dist_v = depth_vert
-                break
-            if tile_vert in self.game.map.world_map:
-                wall_dist_v = depth_vert
-                break
-            x_vert += dx
-            y_vert += dy
-            depth_vert += delta_depth
-
-        player_dist = max(player_dist_v, player_dist_h)
-        wall_dist = max(wall_dist_v, wall_dist_h)
-
-        if 0 < player_dist < wall_dist or not wall_dist:
-            return True
-        return False
+        visible, _ = self.game.raycasting.line_of_sight([self.theta], [self.map_pos])
+        return bool(visible[0])
 
     def draw_ray_cast(self):
         pg.draw.circle(self.game.screen, 'red', (100 * self.x, 100 * self.y), 15)
@@ -205,7 +167,7 @@ class CacoDemonNPC(NPC):
         self.attack_dist = 1.0
         self.health = 150
         self.attack_damage = 25
-        self.speed = 0.05
+        self.speed = 0.005
         self.accuracy = 0.35
         self.kill_score = 300
 
@@ -217,6 +179,6 @@ class CyberDemonNPC(NPC):
         self.attack_dist = 6
         self.health = 350
         self.attack_damage = 15
-        self.speed = 0.055
+        self.speed = 0.0055
         self.accuracy = 0.25
         self.kill_score = 500
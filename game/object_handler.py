@@ -1,5 +1,7 @@
 from sprite_object import *
 from npc import *
+from ai_scheduler import AIScheduler
+from spatial_hash import SpatialHash
 from random import choices, randrange
 
 
@@ -14,7 +16,10 @@ class ObjectHandler:
         self.anim_sprite_path = 'resources/sprites/animated_sprites/'
         add_sprite = self.add_sprite
         add_npc = self.add_npc
-        self.npc_positions = {}
+        # live NPCs by tile, NPCs move themselves between cells as they walk
+        self.npc_positions = SpatialHash()
+        self.max_hit_radius = 0
+        self.ai_scheduler = AIScheduler(game)
 
         # spawn npc
         self.enemies = 20  # npc count
@@ -61,32 +66,67 @@ class ObjectHandler:
         for i in range(self.enemies):
                 npc = choices(self.npc_types, self.weights)[0]
                 pos = x, y = randrange(self.game.map.cols), randrange(self.game.map.rows)
-                while (pos in self.game.map.world_map) or (pos in self.restricted_area):
+                while self.game.map.is_wall(x, y) or (pos in self.restricted_area):
                     pos = x, y = randrange(self.game.map.cols), randrange(self.game.map.rows)
                 self.add_npc(npc(self.game, pos=(x + 0.5, y + 0.5)))
 
     def check_win(self):
         if not len(self.npc_positions):
-            self.game.object_renderer.win()
-            self.game.object_renderer.draw_final_score(self.game.player.score)
-            pg.display.flip()
-            waiting = True
-            while waiting:
-                for event in pg.event.get():
-                    if event.type == pg.KEYDOWN:
-                        if event.key == pg.K_RETURN or event.key == pg.K_r:  # Press Enter or R to restart
-                            waiting = False
-                pg.time.delay(100)  # Small delay to avoid CPU overuse
-            self.game.new_game()
+            self.game.end_round(self.game.object_renderer.win)
+
+    def reset(self):
+        """Respawn the enemies for a new round, static sprites and loaded frames are kept"""
+        self.npc_list = []
+        self.npc_positions.clear()
+        self.spawn_npc()
+
+    @property
+    def occupancy_epoch(self):
+        return self.npc_positions.epoch
+
+    def resolve_shot(self):
+        """The nearest live NPC on the ray through the crosshair takes the shot, walls stop the ray"""
+        player = self.game.player
+        if not player.shot:
+            return
+        wall_depth = self.game.raycasting.wall_depth(player.angle)
+        ox, oy = player.pos
+        dx, dy = math.cos(player.angle), math.sin(player.angle)
+
+        target, target_depth = None, wall_depth
+        for npc in self.npc_positions.query_line(ox, oy, dx, dy, wall_depth, self.max_hit_radius):
+            depth = (npc.x - ox) * dx + (npc.y - oy) * dy
+            if 0 < depth < target_depth and abs((npc.x - ox) * dy - (npc.y - oy) * dx) <= npc.hit_radius:
+                target, target_depth = npc, depth
+        if target is None:
+            return
+
+        # a target out of the weapon's range still stops the shot
+        player.shot = False
+        if math.hypot(target.x - ox, target.y - oy) <= self.game.weapon.range:
+            target.get_hit(self.game.weapon.damage)
 
     def update(self):
-        self.npc_positions = {npc.map_pos for npc in self.npc_list if npc.alive}
+        [npc.store_pos() for npc in self.npc_list]
         [sprite.update() for sprite in self.sprite_list]
-        [npc.update() for npc in self.npc_list]
+        self.resolve_shot()
+        if AI_SCHEDULER:
+            self.ai_scheduler.update(self.npc_list)
+        else:
+            [npc.update() for npc in self.npc_list]
         self.check_win()
 
+    def get_sprites(self):
+        """Project every sprite and NPC for the frame being drawn"""
+        [sprite.get_sprite() for sprite in self.sprite_list]
+        [npc.get_sprite() for npc in self.npc_list]
+
     def add_npc(self, npc):
         self.npc_list.append(npc)
+        if npc.alive:
+            self.max_hit_radius = max(self.max_hit_radius, npc.hit_radius)
+            npc.cell = npc.map_pos
+            self.npc_positions.insert(npc, npc.cell)
 
     def add_sprite(self, sprite):
         self.sprite_list.append(sprite)
\ No newline at end of file
@@ -1,5 +1,10 @@
 import pygame as pg
+import numpy as np
+from operator import itemgetter
 from settings import *
+from texture_atlas import TextureAtlas
+from wall_renderer import WallRenderer
+from assets import assets
 
 
 class ObjectRenderer:
@@ -7,6 +12,8 @@ class ObjectRenderer:
         self.game = game
         self.screen = game.screen
         self.wall_textures = self.load_wall_textures()
+        self.wall_atlas = TextureAtlas(self.wall_textures)
+        self.wall_renderer = WallRenderer(game, self.wall_textures) if WALL_RENDER_MODE == 'framebuffer' else None
         self.sky_image = self.get_texture('resources/textures/sky.png', (WIDTH, HALF_HEIGHT))
         self.sky_offset = 0
         self.blood_screen = self.get_texture('resources/textures/blood_screen.png', RES)
@@ -67,14 +74,35 @@ class ObjectRenderer:
         pg.draw.rect(self.screen, FLOOR_COLOR, (0, HALF_HEIGHT, WIDTH, HEIGHT))
 
     def render_game_objects(self):
-        list_objects = sorted(self.game.raycasting.objects_to_render, key=lambda t: t[0], reverse=True)
-        for depth, image, pos in list_objects:
-            self.screen.blit(image, pos)
+        # wall columns never overlap, so they go out in one pass without sorting
+        if self.wall_renderer:
+            self.wall_renderer.draw()
+        else:
+            self.screen.blits([(image, pos) for depth, image, pos in self.game.raycasting.objects_to_render],
+                              doreturn=False)
+        # only sprites need ordering, the wall depth buffer hides whatever is behind a wall
+        sprites = sorted(self.game.raycasting.sprites_to_render, key=itemgetter(0), reverse=True)
+        for depth, image, pos in sprites:
+            self.blit_clipped(image, pos, depth)
+
+    def blit_clipped(self, image, pos, depth):
+        """Blit a sprite only over the ray columns whose wall is farther away than the sprite"""
+        x, y = int(pos[0]), int(pos[1])
+        first_ray = max(0, x // SCALE)
+        last_ray = min(NUM_RAYS, (x + image.get_width()) // SCALE + 1)
+        if first_ray >= last_ray:
+            return
+        visible = self.game.raycasting.depths[first_ray:last_ray] > depth
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], visible, [False])).astype(np.int8)))
+        for start, end in zip(edges[::2], edges[1::2]):
+            left = max(x, (first_ray + start) * SCALE)
+            right = min(x + image.get_width(), (first_ray + end) * SCALE)
+            if left < right:
+                self.screen.blit(image, (left, y), (left - x, 0, right - left, image.get_height()))
 
     @staticmethod
     def get_texture(path, res=(TEXTURE_SIZE, TEXTURE_SIZE)):
-        texture = pg.image.load(path).convert_alpha()
-        return pg.transform.scale(texture, res)
+        return pg.transform.scale(assets.image(path), res)
 
     def load_wall_textures(self):
         return {
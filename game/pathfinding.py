@@ -1,5 +1,49 @@
-from collections import deque
-from functools import lru_cache
+from collections import deque, OrderedDict
+from heapq import heappush, heappop
+from settings import *
+
+INF = float('inf')
+OCTILE_SAVING = DIAGONAL_COST - 2
+
+
+class PathCache:
+    """Bounded LRU of next steps, emptied whenever the NPC occupancy epoch changes"""
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.steps = OrderedDict()
+        self.epoch = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, epoch):
+        if epoch != self.epoch:
+            if self.steps:
+                self.invalidations += 1
+            self.steps.clear()
+            self.epoch = epoch
+        step = self.steps.get(key)
+        if step is None:
+            self.misses += 1
+            return None
+        self.steps.move_to_end(key)
+        self.hits += 1
+        return step
+
+    def put(self, key, step):
+        self.steps[key] = step
+        self.steps.move_to_end(key)
+        if len(self.steps) > self.max_size:
+            self.steps.popitem(last=False)
+
+    def clear(self):
+        self.steps.clear()
+        self.epoch = None
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
 
 
 class PathFinding:
@@ -9,10 +53,54 @@ class PathFinding:
         self.ways = [-1, 0], [0, -1], [1, 0], [0, 1], [-1, -1], [1, -1], [1, 1], [-1, 1]
         self.graph = {}
         self.get_graph()
+        # weighted neighbours for A*, without diagonal steps that cut a wall corner
+        self.weighted_graph = {}
+        self.get_weighted_graph()
+        self.mode = PATHFINDING_MODE
+        self.expansions = 0
+        # next step towards flow_goal for every node that can reach it
+        self.flow_goal = None
+        self.flow_field = {}
+        self.path_cache = PathCache(PATH_CACHE_SIZE)
+
+    def reset(self):
+        self.flow_goal = None
+        self.flow_field = {}
+        self.path_cache.clear()
 
-    @lru_cache
     def get_path(self, start, goal):
-        self.visited = self.bfs(start, goal, self.graph)
+        if self.mode == 'flow_field':
+            if goal != self.flow_goal:
+                self.flow_field = self.get_flow_field(goal)
+                self.flow_goal = goal
+            return self.flow_field.get(start, goal)
+
+        # searches avoid occupied tiles, so a cached step is only valid for the occupancy it saw.
+        # the walls never change during a game, the graphs are built once from them
+        step = self.path_cache.get((start, goal), self.game.object_handler.occupancy_epoch)
+        if step is None:
+            step = self.search_path(start, goal)
+            self.path_cache.put((start, goal), step)
+        return step
+
+    def get_flow_field(self, goal):
+        # one search outward from the goal, each node points at the node it was reached from
+        queue = deque([goal])
+        field = {goal: goal}
+
+        while queue:
+            cur_node = queue.popleft()
+            for next_node in self.graph.get(cur_node, []):
+                if next_node not in field:
+                    queue.append(next_node)
+                    field[next_node] = cur_node
+        return field
+
+    def search_path(self, start, goal):
+        if self.mode == 'astar':
+            self.visited = self.astar(start, goal, self.weighted_graph)
+        else:
+            self.visited = self.bfs(start, goal, self.graph)
         path = [goal]
         step = self.visited.get(goal, start)
 
@@ -22,6 +110,7 @@ class PathFinding:
         return path[-1]
 
     def bfs(self, start, goal, graph):
+        occupied = self.game.object_handler.npc_positions.cells
         queue = deque([start])
         visited = {start: None}
 
@@ -29,19 +118,57 @@ class PathFinding:
             cur_node = queue.popleft()
             if cur_node == goal:
                 break
+            self.expansions += 1
             next_nodes = graph[cur_node]
 
             for next_node in next_nodes:
-                if next_node not in visited and next_node not in self.game.object_handler.npc_positions:
+                if next_node not in visited and next_node not in occupied:
                     queue.append(next_node)
                     visited[next_node] = cur_node
         return visited
 
+    def astar(self, start, goal, graph):
+        occupied = self.game.object_handler.npc_positions.cells
+        goal_x, goal_y = goal
+        open_set = [(0, 0, start)]
+        visited = {start: None}
+        costs = {start: 0}
+        closed = set()
+
+        while open_set:
+            _, cost, cur_node = heappop(open_set)
+            if cur_node == goal:
+                break
+            if cur_node in closed:
+                continue
+            closed.add(cur_node)
+            self.expansions += 1
+
+            for next_node, step_cost in graph[cur_node]:
+                new_cost = cost + step_cost
+                if new_cost < costs.get(next_node, INF) and next_node not in occupied:
+                    costs[next_node] = new_cost
+                    visited[next_node] = cur_node
+                    # octile distance, exact on an open 8-connected grid
+                    dx, dy = abs(next_node[0] - goal_x), abs(next_node[1] - goal_y)
+                    heuristic = dx + dy + OCTILE_SAVING * (dx if dx < dy else dy)
+                    heappush(open_set, (new_cost + heuristic, new_cost, next_node))
+        return visited
+
     def get_next_nodes(self, x, y):
-        return [(x + dx, y + dy) for dx, dy in self.ways if (x + dx, y + dy) not in self.game.map.world_map]
+        return [(x + dx, y + dy) for dx, dy in self.ways if not self.game.map.is_wall(x + dx, y + dy)]
 
     def get_graph(self):
         for y, row in enumerate(self.map):
             for x, col in enumerate(row):
                 if not col:
-                    self.graph[(x, y)] = self.graph.get((x, y), []) + self.get_next_nodes(x, y)
\ No newline at end of file
+                    self.graph[(x, y)] = self.graph.get((x, y), []) + self.get_next_nodes(x, y)
+
+    def get_weighted_graph(self):
+        is_wall = self.game.map.is_wall
+        for (x, y), next_nodes in self.graph.items():
+            self.weighted_graph[(x, y)] = [
+                ((next_x, next_y), DIAGONAL_COST if next_x != x and next_y != y else 1)
+                for next_x, next_y in next_nodes
+                if next_x == x or next_y == y or not (is_wall(next_x, y) or is_wall(x, next_y))
+            ]
\ No newline at end of file
@@ -1,5 +1,4 @@
 import pygame as pg
-import sys
 import math
 from settings import *
 
@@ -141,8 +140,7 @@ class PauseMenu:
             elif self.options_button.handle_event(event):
                 self.current_menu = "options"
             elif self.quit_button.handle_event(event):
-                pg.quit()
-                sys.exit()
+                self.game.quit()
         elif self.current_menu == "options":
             if self.back_button.handle_event(event):
                 self.current_menu = "main"
@@ -6,51 +6,45 @@ import glm
 class Player:
     def __init__(self, game):
         self.game = game
-        self.x, self.y = PLAYER_POS
-        self.angle = PLAYER_ANGLE
-        self.shot = False
-        self.health = PLAYER_MAX_HEALTH
-        self.score = 0  # 🪙 Add score counter
-        self.rel = 0
         self.health_recovery_delay = 30
-        self.time_prev = pg.time.get_ticks()
         self.diag_move_corr = 1 / math.sqrt(2)
         
         # Hand tracking integration flags
         self.use_hand_tracking = True
         self.hand_movement_enabled = True
         
+        self.weapon_switch_delay = 300  # 300ms cooldown
+        self.reset()
+
+    def reset(self):
+        """Put the player back at the start of a round"""
+        self.x, self.y = PLAYER_POS
+        self.angle = PLAYER_ANGLE
+        # pose at the start of the current tick, frames are drawn in between
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
+        self.shot = False
+        self.health = PLAYER_MAX_HEALTH
+        self.score = 0  # 🪙 Add score counter
+        self.rel = 0
+        self.time_prev = self.game.time
+
         # Weapon switching cooldown to prevent rapid switching
         self.weapon_switch_cooldown = 0
-        self.weapon_switch_delay = 300  # 300ms cooldown
 
     def recover_health(self):
         if self.check_health_recovery_delay() and self.health < PLAYER_MAX_HEALTH:
             self.health += 1
 
     def check_health_recovery_delay(self):
-        time_now = pg.time.get_ticks()
+        time_now = self.game.time
         if time_now - self.time_prev > self.health_recovery_delay:
             self.time_prev = time_now
             return True
 
     def check_game_over(self):
         if self.health < 1:
-            # Show Game Over screen and final score
-            self.game.object_renderer.game_over()
-            self.game.object_renderer.draw_final_score(self.score)
-            pg.display.flip()
-
-            # Wait for player input to restart
-            waiting = True
-            while waiting:
-                for event in pg.event.get():
-                    if event.type == pg.KEYDOWN:
-                        if event.key == pg.K_RETURN or event.key == pg.K_r:  # Press Enter or R to restart
-                            waiting = False
-                pg.time.delay(100)  # Small delay to avoid CPU overuse
-
-            self.game.new_game()
+            # the Game Over screen and the restart wait for the end of the tick
+            self.game.end_round(self.game.object_renderer.game_over)
 
     def get_damage(self, damage):
         self.health -= damage
@@ -72,7 +66,7 @@ class Player:
         elif event.type == pg.KEYDOWN:
             # Handle F key for weapon switching
             if event.key == pg.K_f:
-                current_time = pg.time.get_ticks()
+                current_time = self.game.time
                 if current_time - self.weapon_switch_cooldown > self.weapon_switch_delay:
                     self.game.weapon.toggle_weapon()
                     self.weapon_switch_cooldown = current_time
@@ -112,7 +106,7 @@ class Player:
 
         # Handle F key for weapon switching (continuous press check)
         if keys[pg.K_f]:
-            current_time = pg.time.get_ticks()
+            current_time = self.game.time
             if current_time - self.weapon_switch_cooldown > self.weapon_switch_delay:
                 self.game.weapon.toggle_weapon()
                 self.weapon_switch_cooldown = current_time
@@ -123,8 +117,7 @@ class Player:
         """Main movement function - uses hand tracking or falls back to keyboard"""
         # Check if hand tracking is available and left hand is detected
         if (self.use_hand_tracking and 
-            hasattr(self.game, 'hand_controller') and 
-            self.game.hand_controller.left_hand_present):
+            self.game.hand.left_hand_present):
             
             # Hand tracking movement is handled in main.py's handle_hand_movement()
             # This function only handles keyboard fallback
@@ -136,7 +129,7 @@ class Player:
         self.angle %= math.tau
 
     def check_wall(self, x, y):
-        return (x, y) not in self.game.map.world_map
+        return not self.game.map.is_wall(x, y)
 
     def check_wall_collision(self, dx, dy):
         scale = PLAYER_SIZE_SCALE / self.game.delta_time
@@ -149,8 +142,7 @@ class Player:
         """Handle mouse control for camera rotation (fallback when hand tracking fails)"""
         # Check if hand tracking is available and right hand is detected
         if (self.use_hand_tracking and 
-            hasattr(self.game, 'hand_controller') and 
-            self.game.hand_controller.right_hand_coords):
+            self.game.hand.right_hand_coords):
             
             # Hand tracking camera control is handled in main.py
             return
@@ -168,10 +160,24 @@ class Player:
         self.mouse_control()
         self.recover_health()
 
+    def store_pose(self):
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
+
     @property
     def pos(self):
         return self.x, self.y
 
+    @property
+    def view_pos(self):
+        alpha = self.game.alpha
+        return self.prev_x + (self.x - self.prev_x) * alpha, self.prev_y + (self.y - self.prev_y) * alpha
+
+    @property
+    def view_angle(self):
+        # the shorter way round, the angle wraps at tau
+        turn = (self.angle - self.prev_angle + math.pi) % math.tau - math.pi
+        return (self.prev_angle + turn * self.game.alpha) % math.tau
+
     @property
     def map_pos(self):
         return int(self.x), int(self.y)
@@ -1,6 +1,7 @@
 import pygame as pg
-import math
+import numpy as np
 from settings import *
+from surface_cache import SurfaceCache
 
 
 
@@ -9,98 +10,199 @@ class RayCasting:
         self.game = game
         self.ray_casting_result = []
         self.objects_to_render = []
+        self.sprites_to_render = []
         self.textures = self.game.object_renderer.wall_textures
+        self.atlas = self.game.object_renderer.wall_atlas
+        self.grid = self.game.map.grid
+        # scaled wall strips keyed by texture id, texture column and quantized height
+        self.wall_cache = SurfaceCache(WALL_CACHE_BUDGET)
 
     def get_objects_to_render(self):
         self.objects_to_render = []
         for ray, values in enumerate(self.ray_casting_result):
             depth, proj_height, texture, offset = values
+            texture_x = int(offset * (TEXTURE_SIZE - SCALE))
 
             if proj_height < HEIGHT:
-                wall_column = self.textures[texture].subsurface(
-                    offset * (TEXTURE_SIZE - SCALE), 0, SCALE, TEXTURE_SIZE
-                )
-                wall_column = pg.transform.scale(wall_column, (SCALE, proj_height))
+                proj_height = int(proj_height) // WALL_CACHE_HEIGHT_STEP * WALL_CACHE_HEIGHT_STEP
+                key = (texture, texture_x, proj_height, False)
+                wall_column = self.wall_cache.get(key)
+                if wall_column is None:
+                    wall_column = self.atlas.get_column(texture, texture_x, proj_height)
+                    wall_column = pg.transform.scale(wall_column, (SCALE, proj_height))
+                    self.wall_cache.put(key, wall_column)
                 wall_pos = (ray * SCALE, HALF_HEIGHT - proj_height // 2)
             else:
-                texture_height = TEXTURE_SIZE * HEIGHT / proj_height
-                wall_column = self.textures[texture].subsurface(
-                    offset * (TEXTURE_SIZE - SCALE), HALF_TEXTURE_SIZE - texture_height // 2,
-                    SCALE, texture_height
-                )
-                wall_column = pg.transform.scale(wall_column, (SCALE, HEIGHT))
+                texture_height = int(TEXTURE_SIZE * HEIGHT / proj_height)
+                key = (texture, texture_x, texture_height, True)
+                wall_column = self.wall_cache.get(key)
+                if wall_column is None:
+                    wall_column = self.atlas.get_column(texture, texture_x).subsurface(
+                        0, HALF_TEXTURE_SIZE - texture_height // 2, SCALE, texture_height
+                    )
+                    wall_column = pg.transform.scale(wall_column, (SCALE, HEIGHT))
+                    self.wall_cache.put(key, wall_column)
                 wall_pos = (ray * SCALE, 0)
 
             self.objects_to_render.append((depth, wall_column, wall_pos))
 
+    def trace(self, x, y, dx, dy, depth, delta_depth):
+        # positions along every ray, accumulated step by step like the scalar DDA did
+        steps = np.empty((len(x), MAX_DEPTH + 1))
+        steps[:, 0], steps[:, 1:] = x, dx[:, None]
+        xs = np.add.accumulate(steps, axis=1)
+        steps[:, 0], steps[:, 1:] = y, dy[:, None]
+        ys = np.add.accumulate(steps, axis=1)
+        steps[:, 0], steps[:, 1:] = depth, delta_depth[:, None]
+        depths = np.add.accumulate(steps, axis=1)
+
+        # tiles outside the grid are empty, same as a miss in world_map
+        tx, ty = np.trunc(xs[:, :-1]), np.trunc(ys[:, :-1])
+        inside = (tx >= 0) & (tx < self.grid.shape[1]) & (ty >= 0) & (ty < self.grid.shape[0])
+        tx, ty = np.where(inside, tx, -1).astype(np.intp), np.where(inside, ty, -1).astype(np.intp)
+        tiles = self.grid[ty, tx]
+        tiles[~inside] = 0
+        return xs, ys, depths, tx, ty, tiles
+
+    def march(self, x, y, dx, dy, depth, delta_depth):
+        xs, ys, depths, _, _, tiles = self.trace(x, y, dx, dy, depth, delta_depth)
+
+        # first wall along each ray, or the point after MAX_DEPTH steps if none was found
+        hit = tiles > 0
+        found = hit.any(axis=1)
+        step = np.where(found, hit.argmax(axis=1), MAX_DEPTH)
+        rays = np.arange(len(x))
+        texture = tiles[rays, np.minimum(step, MAX_DEPTH - 1)]
+
+        # a ray that hits nothing keeps the texture of the last ray that did
+        last_hit = np.maximum.accumulate(np.where(found, rays, -1))
+        texture = np.where(last_hit >= 0, texture[last_hit], 1)
+        return xs[rays, step], ys[rays, step], depths[rays, step], texture
+
+    def cast(self, ox, oy, ray_angles):
+        """Distance along each ray to the first wall, its texture and the texture offset of the hit"""
+        x_map, y_map = int(ox), int(oy)
+        sin_a = np.sin(ray_angles)
+        cos_a = np.cos(ray_angles)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # horizontals
+            y_hor = np.where(sin_a > 0, y_map + 1, y_map - 1e-6)
+            dy = np.where(sin_a > 0, 1.0, -1.0)
+            depth_hor = (y_hor - oy) / sin_a
+            x_hor = ox + depth_hor * cos_a
+            delta_depth = dy / sin_a
+            dx = delta_depth * cos_a
+            x_hor, _, depth_hor, texture_hor = self.march(x_hor, y_hor, dx, dy, depth_hor, delta_depth)
+
+            # verticals
+            x_vert = np.where(cos_a > 0, x_map + 1, x_map - 1e-6)
+            dx = np.where(cos_a > 0, 1.0, -1.0)
+            depth_vert = (x_vert - ox) / cos_a
+            y_vert = oy + depth_vert * sin_a
+            delta_depth = dx / cos_a
+            dy = delta_depth * sin_a
+            _, y_vert, depth_vert, texture_vert = self.march(x_vert, y_vert, dx, dy, depth_vert, delta_depth)
+
+        # depth, texture offset
+        vert = depth_vert < depth_hor
+        depth = np.where(vert, depth_vert, depth_hor)
+        texture = np.where(vert, texture_vert, texture_hor)
+        y_vert %= 1
+        x_hor %= 1
+        offset = np.where(vert,
+                          np.where(cos_a > 0, y_vert, 1 - y_vert),
+                          np.where(sin_a > 0, 1 - x_hor, x_hor))
+        return depth, texture, offset
+
+    def wall_depth(self, angle):
+        """Distance from the player to the wall along angle at the current tick"""
+        ox, oy = self.game.player.pos
+        # nudged like the screen rays, so it never runs exactly along a grid line
+        depth, _, _ = self.cast(ox, oy, np.array([angle + 0.0001]))
+        return float(depth[0])
+
     def ray_cast(self):
-        self.ray_casting_result = []
-        texture_vert, texture_hor = 1, 1
+        # the view is drawn from the player pose interpolated between the last two ticks
+        ox, oy = self.game.player.view_pos
+        player_angle = self.game.player.view_angle
+
+        angles = np.full(NUM_RAYS, DELTA_ANGLE)
+        angles[0] = player_angle - HALF_FOV + 0.0001
+        ray_angles = np.add.accumulate(angles)
+        depth, texture, offset = self.cast(ox, oy, ray_angles)
+
+        # remove fishbowl effect
+        depth *= np.cos(player_angle - ray_angles)
+
+        # projection
+        proj_height = SCREEN_DIST / (depth + 0.0001)
+
+        # ray casting result
+        self.depths, self.proj_heights, self.texture_ids, self.offsets = depth, proj_height, texture, offset
+        self.ray_casting_result = list(zip(depth.tolist(), proj_height.tolist(),
+                                           texture.tolist(), offset.tolist()))
+
+    def seek(self, x, y, dx, dy, depth, delta_depth, target_x, target_y):
+        """Depth at which each ray enters its target tile and depth of the first wall before it, 0 if not reached"""
+        _, _, depths, tx, ty, tiles = self.trace(x, y, dx, dy, depth, delta_depth)
+        target = (tx == target_x[:, None]) & (ty == target_y[:, None])
+        stop = target | (tiles > 0)
+        found = stop.any(axis=1)
+        rays = np.arange(len(x))
+        step = stop.argmax(axis=1)
+        reached = target[rays, step]
+        depth = np.where(found, depths[rays, step], 0.0)
+        return np.where(reached, depth, 0.0), np.where(reached, 0.0, depth)
+
+    def line_of_sight(self, angles, tiles):
+        """
+        Visibility of many tiles from the player in one pass, same rules as the old per-NPC DDA.
+        angles are the directions from the player to each tile, returns (visible, depth to the tile)
+        """
         ox, oy = self.game.player.pos
         x_map, y_map = self.game.player.map_pos
+        angles = np.asarray(angles, dtype=np.float64)
+        tiles = np.asarray(tiles, dtype=np.intp).reshape(-1, 2)
+        target_x, target_y = tiles[:, 0], tiles[:, 1]
+        sin_a = np.sin(angles)
+        cos_a = np.cos(angles)
 
-        ray_angle = self.game.player.angle - HALF_FOV + 0.0001
-        for ray in range(NUM_RAYS):
-            sin_a = math.sin(ray_angle)
-            cos_a = math.cos(ray_angle)
-
+        with np.errstate(divide='ignore', invalid='ignore'):
             # horizontals
-            y_hor, dy = (y_map + 1, 1) if sin_a > 0 else (y_map - 1e-6, -1)
-
+            y_hor = np.where(sin_a > 0, y_map + 1, y_map - 1e-6)
+            dy = np.where(sin_a > 0, 1.0, -1.0)
             depth_hor = (y_hor - oy) / sin_a
             x_hor = ox + depth_hor * cos_a
-
             delta_depth = dy / sin_a
             dx = delta_depth * cos_a
-
-            for i in range(MAX_DEPTH):
-                tile_hor = int(x_hor), int(y_hor)
-                if tile_hor in self.game.map.world_map:
-                    texture_hor = self.game.map.world_map[tile_hor]
-                    break
-                x_hor += dx
-                y_hor += dy
-                depth_hor += delta_depth
+            target_dist_h, wall_dist_h = self.seek(x_hor, y_hor, dx, dy, depth_hor, delta_depth,
+                                                   target_x, target_y)
 
             # verticals
-            x_vert, dx = (x_map + 1, 1) if cos_a > 0 else (x_map - 1e-6, -1)
-
+            x_vert = np.where(cos_a > 0, x_map + 1, x_map - 1e-6)
+            dx = np.where(cos_a > 0, 1.0, -1.0)
             depth_vert = (x_vert - ox) / cos_a
             y_vert = oy + depth_vert * sin_a
-
             delta_depth = dx / cos_a
             dy = delta_depth * sin_a
+            target_dist_v, wall_dist_v = self.seek(x_vert, y_vert, dx, dy, depth_vert, delta_depth,
+                                                   target_x, target_y)
 
-            for i in range(MAX_DEPTH):
-                tile_vert = int(x_vert), int(y_vert)
-                if tile_vert in self.game.map.world_map:
-                    texture_vert = self.game.map.world_map[tile_vert]
-                    break
-                x_vert += dx
-                y_vert += dy
-                depth_vert += delta_depth
-
-            # depth, texture offset
-            if depth_vert < depth_hor:
-                depth, texture = depth_vert, texture_vert
-                y_vert %= 1
-                offset = y_vert if cos_a > 0 else (1 - y_vert)
-            else:
-                depth, texture = depth_hor, texture_hor
-                x_hor %= 1
-                offset = (1 - x_hor) if sin_a > 0 else x_hor
-
-            # remove fishbowl effect
-            depth *= math.cos(self.game.player.angle - ray_angle)
-
-            # projection
-            proj_height = SCREEN_DIST / (depth + 0.0001)
-
-            # ray casting result
-            self.ray_casting_result.append((depth, proj_height, texture, offset))
-
-            ray_angle += DELTA_ANGLE
+        target_dist = np.maximum(target_dist_v, target_dist_h)
+        wall_dist = np.maximum(wall_dist_v, wall_dist_h)
+        same_tile = (target_x == x_map) & (target_y == y_map)
+        visible = same_tile | ((0 < target_dist) & (target_dist < wall_dist)) | (wall_dist == 0)
+        return visible, target_dist
 
     def update(self):
         self.ray_cast()
-        self.get_objects_to_render()
\ No newline at end of file
+        self.prepare_objects()
+
+    def prepare_objects(self):
+        self.sprites_to_render = []
+        if WALL_RENDER_MODE == 'framebuffer':
+            # walls are drawn straight from the arrays
+            self.objects_to_render = []
+        else:
+            self.get_objects_to_render()
\ No newline at end of file
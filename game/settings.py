@@ -5,7 +5,13 @@ RES = WIDTH, HEIGHT = 1920, 1080
 # RES = WIDTH, HEIGHT = 1920, 1080
 HALF_WIDTH = WIDTH // 2
 HALF_HEIGHT = HEIGHT // 2
-FPS = 100
+FPS = 100  # render rate cap
+
+# fixed timestep simulation, frames are drawn at their own rate and interpolate between ticks
+FIXED_TIMESTEP = True  # False runs one simulation step per frame with the measured frame time
+SIM_RATE = 60  # simulation ticks per second
+SIM_DT = 1000 / SIM_RATE  # ms per tick, delta_time during a tick
+MAX_SIM_STEPS = 5  # ticks per frame at most, a slow machine drops the backlog instead of spiralling
 
 PLAYER_POS = 1.5, 5  # mini_map
 PLAYER_ANGLE = 0
@@ -34,3 +40,52 @@ SCALE = WIDTH // NUM_RAYS
 TEXTURE_SIZE = 256
 HALF_TEXTURE_SIZE = TEXTURE_SIZE // 2
 
+# 'blit' draws a scaled surface per wall column, 'framebuffer' writes wall pixels into the screen array
+WALL_RENDER_MODE = 'blit'
+
+# pre-sliced wall texture columns
+WALL_TEXTURE_MIP_LEVELS = 0  # extra half-size copies of every column, 0 disables mipmapping
+
+# scaled wall column cache
+WALL_CACHE_BUDGET = 64 * 1024 * 1024  # bytes of scaled strips kept before LRU eviction
+WALL_CACHE_HEIGHT_STEP = 2  # projected heights are rounded down to a multiple of this
+SHOW_CACHE_STATS = False  # append cache hit rates to the window caption
+
+# scaled sprite cache
+SPRITE_CACHE_BUDGET = 64 * 1024 * 1024  # bytes of scaled sprite frames kept before LRU eviction
+SPRITE_CACHE_SIZE_STEP = 2  # projected sprite heights are rounded down to a multiple of this
+
+# 'bfs' searches from every NPC on every query, 'astar' does the same with octile costs and no
+# corner cutting, 'flow_field' searches once from the player's tile each time it changes
+# and NPCs read their next step from the result
+PATHFINDING_MODE = 'bfs'
+DIAGONAL_COST = math.sqrt(2)
+PATH_CACHE_SIZE = 1024  # (start, goal) steps kept by the 'bfs' mode between occupancy changes
+
+# NPC AI scheduling, path queries run at a rate picked by state and distance, line of sight every tick
+AI_SCHEDULER = True  # False runs the full NPC logic every tick
+AI_FRAME_BUDGET_MS = 2.0  # thinking stops for the tick once this is spent, the rest wait a tick
+AI_THINKS_PER_TICK = 8  # headless runs cap thinks by count instead, so their ticks don't depend on the host
+AI_NEAR_DIST = 8  # chasing NPCs closer than this think at AI_NEAR_INTERVAL
+AI_NEAR_INTERVAL = 0  # ms between thinks, 0 means every tick
+AI_FAR_INTERVAL = 100
+AI_IDLE_INTERVAL = 250
+
+# hand tracking
+HAND_TRACKING_PROCESS = True  # False runs the tracker in a thread of the game process
+CAPTURE_WIDTH, CAPTURE_HEIGHT = 640, 480  # asked of the camera, the driver picks the nearest mode it has
+CAPTURE_FPS = 30  # also the pacing used when the driver doesn't report a rate
+CAPTURE_RETRY_DELAY = 0.05  # seconds to wait after a failed grab, doubled on every failure in a row
+CAPTURE_RETRY_MAX = 1.0
+HAND_DETECTION_RATE = 30  # findHands calls per second at most, frames over the rate are grabbed but not decoded
+HAND_ROI_TRACKING = True  # once both hands are found, detect on a crop around them instead of the whole frame
+HAND_ROI_PADDING = 0.5  # the crop extends this much of the hands' bounding box size past it on every side
+HAND_ROI_WIDTH = 320  # crops wider than this are scaled down to it for detection
+HAND_ROI_REFRESH = 30  # whole frame detection at least every this many detections, catches a hand going astray
+LATENCY_SAMPLES = 600  # camera frames kept for the capture to display latency percentiles
+LATENCY_OVERLAY = False  # show the percentiles under the hand status, F3 toggles
+LATENCY_LOG = ''  # csv the kept latency samples are written to on quit, empty for none
+
+# asset preloading
+PRELOAD_WORKERS = 4  # threads decoding images and sounds at startup
+
@@ -1,4 +1,6 @@
+import os
 import pygame as pg
+from assets import assets
 
 
 class Sound:
@@ -6,12 +8,20 @@ class Sound:
         self.game = game
         pg.mixer.init()
         self.path = 'resources/sound/'
-        self.shotgun = pg.mixer.Sound(self.path + 'shotgun.wav')
-        self.knife = pg.mixer.Sound(self.path + 'knife.wav')
-        self.npc_pain = pg.mixer.Sound(self.path + 'npc_pain.wav')
-        self.npc_death = pg.mixer.Sound(self.path + 'npc_death.wav')
-        self.npc_shot = pg.mixer.Sound(self.path + 'npc_attack.wav')
+        self.shotgun = assets.sound(self.path + 'shotgun.wav')
+        self.knife = assets.sound(self.path + 'knife.wav')
+        # the same objects the weapon plays when firing, the pause menu volume slider changes them later
+        self.shotgun.set_volume(0.4)
+        self.knife.set_volume(0.4)
+        self.npc_pain = assets.sound(self.path + 'npc_pain.wav')
+        self.npc_death = assets.sound(self.path + 'npc_death.wav')
+        self.npc_shot = assets.sound(self.path + 'npc_attack.wav')
         self.npc_shot.set_volume(0.2)
-        self.player_pain = pg.mixer.Sound(self.path + 'player_pain.wav')
-        self.theme = pg.mixer.music.load(self.path + 'theme.mp3')
+        self.player_pain = assets.sound(self.path + 'player_pain.wav')
+        # not among the shipped resources, dry fire stays silent without it
+        self.empty_click = None
+        if os.path.exists(self.path + 'empty_click.wav'):
+            self.empty_click = assets.sound(self.path + 'empty_click.wav')
+            self.empty_click.set_volume(0.5)
+        self.theme = pg.mixer.music.load(assets.music(self.path + 'theme.mp3'), 'mp3')
         pg.mixer.music.set_volume(0.3)
\ No newline at end of file
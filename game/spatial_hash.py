@@ -0,0 +1,80 @@
+import math
+
+
+class SpatialHash:
+    """Objects bucketed by the map tile they stand on, updated by the objects as they move between tiles"""
+    def __init__(self):
+        # tile -> objects on it, only occupied tiles have an entry
+        self.cells = {}
+        # bumped whenever a tile becomes occupied or free, anything derived from occupancy checks it
+        self.epoch = 0
+
+    def insert(self, obj, cell):
+        objects = self.cells.get(cell)
+        if objects is None:
+            self.cells[cell] = [obj]
+            self.epoch += 1
+        else:
+            objects.append(obj)
+
+    def remove(self, obj, cell):
+        objects = self.cells[cell]
+        objects.remove(obj)
+        if not objects:
+            del self.cells[cell]
+            self.epoch += 1
+
+    def move(self, obj, old_cell, new_cell):
+        if old_cell != new_cell:
+            self.remove(obj, old_cell)
+            self.insert(obj, new_cell)
+
+    def count(self, cell):
+        return len(self.cells.get(cell, ()))
+
+    def query_radius(self, x, y, radius):
+        """Objects whose position is within radius of (x, y), only the tiles under the circle are visited"""
+        found = []
+        cells = self.cells
+        radius_sq = radius * radius
+        for cell_y in range(math.floor(y - radius), math.floor(y + radius) + 1):
+            for cell_x in range(math.floor(x - radius), math.floor(x + radius) + 1):
+                for obj in cells.get((cell_x, cell_y), ()):
+                    if (obj.x - x) ** 2 + (obj.y - y) ** 2 <= radius_sq:
+                        found.append(obj)
+        return found
+
+    def query_line(self, x, y, dx, dy, length, radius):
+        """
+        Objects within radius of the line from (x, y) along the unit direction (dx, dy), and no further than
+        radius outside its first length units. Only the tiles around one sample point per tile are visited
+        """
+        found = []
+        seen = set()
+        cells = self.cells
+        # any point of the segment is within half a tile of a sample
+        reach = radius + 0.5
+        for step in range(math.ceil(length) + 1):
+            t = min(step, length)
+            px, py = x + dx * t, y + dy * t
+            for cell_y in range(math.floor(py - reach), math.floor(py + reach) + 1):
+                for cell_x in range(math.floor(px - reach), math.floor(px + reach) + 1):
+                    cell = cell_x, cell_y
+                    if cell in seen:
+                        continue
+                    seen.add(cell)
+                    for obj in cells.get(cell, ()):
+                        along = (obj.x - x) * dx + (obj.y - y) * dy
+                        if -radius <= along <= length + radius and abs((obj.x - x) * dy - (obj.y - y) * dx) <= radius:
+                            found.append(obj)
+        return found
+
+    def clear(self):
+        self.cells.clear()
+        self.epoch += 1
+
+    def __contains__(self, cell):
+        return cell in self.cells
+
+    def __len__(self):
+        return len(self.cells)
@@ -1,8 +1,12 @@
 import pygame as pg
 from settings import *
-import os
+from surface_cache import SurfaceCache
+from assets import assets
 from collections import deque
 
+# scaled sprite frames shared by every sprite and NPC, keyed by frame and projected size
+sprite_cache = SurfaceCache(SPRITE_CACHE_BUDGET)
+
 
 class SpriteObject:
     def __init__(self, game, path='resources/sprites/static_sprites/candlebra.png',
@@ -10,7 +14,9 @@ class SpriteObject:
         self.game = game
         self.player = game.player
         self.x, self.y = pos
-        self.image = pg.image.load(path).convert_alpha()
+        # position at the start of the current tick, frames are drawn in between
+        self.prev_x, self.prev_y = pos
+        self.image = assets.image(path)
         self.IMAGE_WIDTH = self.image.get_width()
         self.IMAGE_HALF_WIDTH = self.image.get_width() // 2
         self.IMAGE_RATIO = self.IMAGE_WIDTH / self.image.get_height()
@@ -21,36 +27,59 @@ class SpriteObject:
 
     def get_sprite_projection(self):
         proj = SCREEN_DIST / self.norm_dist * self.SPRITE_SCALE
-        proj_width, proj_height = proj * self.IMAGE_RATIO, proj
+        proj_height = int(proj) // SPRITE_CACHE_SIZE_STEP * SPRITE_CACHE_SIZE_STEP
+        proj_width = int(proj_height * self.IMAGE_RATIO)
 
-        image = pg.transform.scale(self.image, (proj_width, proj_height))
+        key = (self.image, proj_width, proj_height)
+        image = sprite_cache.get(key)
+        if image is None:
+            image = pg.transform.scale(self.image, (proj_width, proj_height))
+            sprite_cache.put(key, image)
 
         self.sprite_half_width = proj_width // 2
         height_shift = proj_height * self.SPRITE_HEIGHT_SHIFT
         pos = self.screen_x - self.sprite_half_width, HALF_HEIGHT - proj_height // 2 + height_shift
 
-        self.game.raycasting.objects_to_render.append((self.norm_dist, image, pos))
+        self.game.raycasting.sprites_to_render.append((self.norm_dist, image, pos))
 
-    def get_sprite(self):
+    def locate(self):
+        """Direction and distance from the player at the current tick"""
         dx = self.x - self.player.x
         dy = self.y - self.player.y
         self.dx, self.dy = dx, dy
         self.theta = math.atan2(dy, dx)
+        self.dist = math.hypot(dx, dy)
 
-        delta = self.theta - self.player.angle
-        if (dx > 0 and self.player.angle > math.pi) or (dx < 0 and dy < 0):
+    def get_sprite(self):
+        """Project the sprite for this frame, from positions interpolated between the last two ticks"""
+        x, y = self.view_pos
+        player_x, player_y = self.player.view_pos
+        player_angle = self.player.view_angle
+        dx = x - player_x
+        dy = y - player_y
+        theta = math.atan2(dy, dx)
+
+        delta = theta - player_angle
+        if (dx > 0 and player_angle > math.pi) or (dx < 0 and dy < 0):
             delta += math.tau
 
         delta_rays = delta / DELTA_ANGLE
         self.screen_x = (HALF_NUM_RAYS + delta_rays) * SCALE
 
-        self.dist = math.hypot(dx, dy)
-        self.norm_dist = self.dist * math.cos(delta)
+        self.norm_dist = math.hypot(dx, dy) * math.cos(delta)
         if -self.IMAGE_HALF_WIDTH < self.screen_x < (WIDTH + self.IMAGE_HALF_WIDTH) and self.norm_dist > 0.5:
             self.get_sprite_projection()
 
+    def store_pos(self):
+        self.prev_x, self.prev_y = self.x, self.y
+
+    @property
+    def view_pos(self):
+        alpha = self.game.alpha
+        return self.prev_x + (self.x - self.prev_x) * alpha, self.prev_y + (self.y - self.prev_y) * alpha
+
     def update(self):
-        self.get_sprite()
+        self.locate()
 
 
 class AnimatedSprite(SpriteObject):
@@ -60,7 +89,7 @@ class AnimatedSprite(SpriteObject):
         self.animation_time = animation_time
         self.path = path.rsplit('/', 1)[0]
         self.images = self.get_images(self.path)
-        self.animation_time_prev = pg.time.get_ticks()
+        self.animation_time_prev = self.game.time
         self.animation_trigger = False
 
     def update(self):
@@ -75,15 +104,11 @@ class AnimatedSprite(SpriteObject):
 
     def check_animation_time(self):
         self.animation_trigger = False
-        time_now = pg.time.get_ticks()
+        time_now = self.game.time
         if time_now - self.animation_time_prev > self.animation_time:
             self.animation_time_prev = time_now
             self.animation_trigger = True
 
     def get_images(self, path):
-        images = deque()
-        for file_name in os.listdir(path):
-            if os.path.isfile(os.path.join(path, file_name)):
-                img = pg.image.load(path + '/' + file_name).convert_alpha()
-                images.append(img)
-        return images
+        # frames are shared between instances, each one only rotates its own deque
+        return deque(assets.animation(path))
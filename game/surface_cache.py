@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+
+class SurfaceCache:
+    """LRU cache of surfaces bounded by the number of pixel bytes it holds"""
+    def __init__(self, budget):
+        self.budget = budget
+        # a single surface bigger than this would flush most of the cache, so it is not kept
+        self.max_entry = budget // 8
+        self.size = 0
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.surfaces.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def put(self, key, surface):
+        if self.surface_size(surface) > self.max_entry:
+            return
+        if key in self.surfaces:
+            self.size -= self.surface_size(self.surfaces.pop(key))
+        self.surfaces[key] = surface
+        self.size += self.surface_size(surface)
+        while self.size > self.budget and len(self.surfaces) > 1:
+            _, old_surface = self.surfaces.popitem(last=False)
+            self.size -= self.surface_size(old_surface)
+            self.evictions += 1
+
+    @staticmethod
+    def surface_size(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self.surfaces)
@@ -0,0 +1,104 @@
+import math
+import random
+from types import SimpleNamespace
+from settings import *
+from map import Map
+from raycasting import RayCasting
+
+
+def baseline_ray_cast(world_map, ox, oy, player_angle):
+    """The scalar DDA the vectorized raycaster replaced, one ray at a time"""
+    result = []
+    texture_vert, texture_hor = 1, 1
+    x_map, y_map = int(ox), int(oy)
+
+    ray_angle = player_angle - HALF_FOV + 0.0001
+    for ray in range(NUM_RAYS):
+        sin_a = math.sin(ray_angle)
+        cos_a = math.cos(ray_angle)
+
+        # horizontals
+        y_hor, dy = (y_map + 1, 1) if sin_a > 0 else (y_map - 1e-6, -1)
+
+        depth_hor = (y_hor - oy) / sin_a
+        x_hor = ox + depth_hor * cos_a
+
+        delta_depth = dy / sin_a
+        dx = delta_depth * cos_a
+
+        for i in range(MAX_DEPTH):
+            tile_hor = int(x_hor), int(y_hor)
+            if tile_hor in world_map:
+                texture_hor = world_map[tile_hor]
+                break
+            x_hor += dx
+            y_hor += dy
+            depth_hor += delta_depth
+
+        # verticals
+        x_vert, dx = (x_map + 1, 1) if cos_a > 0 else (x_map - 1e-6, -1)
+
+        depth_vert = (x_vert - ox) / cos_a
+        y_vert = oy + depth_vert * sin_a
+
+        delta_depth = dx / cos_a
+        dy = delta_depth * sin_a
+
+        for i in range(MAX_DEPTH):
+            tile_vert = int(x_vert), int(y_vert)
+            if tile_vert in world_map:
+                texture_vert = world_map[tile_vert]
+                break
+            x_vert += dx
+            y_vert += dy
+            depth_vert += delta_depth
+
+        # depth, texture offset
+        if depth_vert < depth_hor:
+            depth, texture = depth_vert, texture_vert
+            y_vert %= 1
+            offset = y_vert if cos_a > 0 else (1 - y_vert)
+        else:
+            depth, texture = depth_hor, texture_hor
+            x_hor %= 1
+            offset = (1 - x_hor) if sin_a > 0 else x_hor
+
+        # remove fishbowl effect
+        depth *= math.cos(player_angle - ray_angle)
+
+        # projection
+        proj_height = SCREEN_DIST / (depth + 0.0001)
+
+        result.append((depth, proj_height, texture, offset))
+        ray_angle += DELTA_ANGLE
+    return result
+
+
+def make_raycasting():
+    # only the parts of the game the raycast itself reads
+    game = SimpleNamespace(object_renderer=SimpleNamespace(wall_textures=None, wall_atlas=None))
+    game.map = Map(game)
+    game.player = SimpleNamespace()
+    return RayCasting(game)
+
+
+def test_ray_cast_matches_baseline():
+    raycasting = make_raycasting()
+    game_map = raycasting.game.map
+    rng = random.Random(1)
+    for pose in range(300):
+        x, y = rng.randrange(game_map.cols), rng.randrange(game_map.rows)
+        while game_map.is_wall(x, y):
+            x, y = rng.randrange(game_map.cols), rng.randrange(game_map.rows)
+        ox, oy, angle = x + rng.random(), y + rng.random(), rng.uniform(0, math.tau)
+        raycasting.game.player = SimpleNamespace(pos=(ox, oy), view_pos=(ox, oy), view_angle=angle)
+
+        raycasting.ray_cast()
+        expected = baseline_ray_cast(game_map.world_map, ox, oy, angle)
+        assert len(raycasting.ray_casting_result) == len(expected)
+        for ray, (got, want) in enumerate(zip(raycasting.ray_casting_result, expected)):
+            depth, proj_height, texture, offset = got
+            assert texture == want[2], (pose, ray)
+            assert math.isclose(depth, want[0], rel_tol=1e-9, abs_tol=1e-9), (pose, ray)
+            assert math.isclose(proj_height, want[1], rel_tol=1e-9), (pose, ray)
+            assert math.isclose(offset, want[3], rel_tol=1e-9, abs_tol=1e-9), (pose, ray)
@@ -0,0 +1,31 @@
+import pygame as pg
+from settings import *
+
+
+class TextureAtlas:
+    """Wall textures pre-split into SCALE-wide columns, optionally with downscaled mip levels"""
+    def __init__(self, textures, mip_levels=WALL_TEXTURE_MIP_LEVELS):
+        # texture id -> [(level height, columns indexed by texel x)], largest level first
+        self.levels = {}
+        for texture_id, texture in textures.items():
+            columns = self.split(texture)
+            levels = [(texture.get_height(), columns)]
+            for level in range(1, mip_levels + 1):
+                height = texture.get_height() >> level
+                if height < 1:
+                    break
+                levels.append((height, [pg.transform.smoothscale(column, (SCALE, height)) for column in columns]))
+            self.levels[texture_id] = levels
+
+    @staticmethod
+    def split(texture):
+        width, height = texture.get_size()
+        return [texture.subsurface(x, 0, SCALE, height).copy() for x in range(width - SCALE + 1)]
+
+    def get_column(self, texture_id, texture_x, height=TEXTURE_SIZE):
+        """Column at texel texture_x from the smallest level that is still at least height pixels tall"""
+        levels = self.levels[texture_id]
+        for level_height, columns in reversed(levels):
+            if level_height >= height:
+                return columns[texture_x]
+        return levels[0][1][texture_x]
@@ -0,0 +1,44 @@
+import pygame as pg
+import numpy as np
+from settings import *
+
+
+class WallRenderer:
+    """Writes textured wall columns straight into the screen pixels from the raycast result arrays"""
+    def __init__(self, game, textures):
+        self.game = game
+        self.screen = game.screen
+        # every texture as mapped screen pixels, indexed [texture id][texel x][texel y]
+        texels = np.zeros((max(textures) + 1, TEXTURE_SIZE, TEXTURE_SIZE), dtype=np.uint32)
+        for texture_id, texture in textures.items():
+            texels[texture_id] = pg.surfarray.array2d(texture.convert(self.screen))
+        # SCALE-wide strips starting at every texel x, so one lookup fills all screen columns of a ray
+        self.columns = TEXTURE_SIZE - SCALE + 1
+        strips = np.lib.stride_tricks.sliding_window_view(texels, SCALE, axis=1)
+        self.strips = np.ascontiguousarray(strips).reshape(-1, SCALE)
+        self.width = NUM_RAYS * SCALE
+        self.rows = np.arange(HEIGHT, dtype=np.float32)
+
+    def draw(self):
+        ray_casting = self.game.raycasting
+        proj_heights = ray_casting.proj_heights.astype(np.float32)
+        texture_x = (ray_casting.offsets * (TEXTURE_SIZE - SCALE)).astype(np.int32)
+        base = (ray_casting.texture_ids.astype(np.int32) * self.columns + texture_x) * TEXTURE_SIZE
+
+        # only the rows covered by the tallest wall need sampling, walls are centred on the horizon
+        top = HALF_HEIGHT - proj_heights / 2
+        first_row = max(0, int(top.min()))
+        last_row = min(HEIGHT, HEIGHT - first_row)
+        if first_row >= last_row:
+            return
+
+        # texel row for every screen row of every ray, laid out row-major like the screen memory
+        texture_y = (self.rows[first_row:last_row, None] - top) * (TEXTURE_SIZE / proj_heights)
+        on_wall = (texture_y >= 0) & (texture_y < TEXTURE_SIZE)
+        texture_y = np.clip(texture_y, 0, TEXTURE_SIZE - 1).astype(np.int32)
+        wall_pixels = self.strips.take(base + texture_y, axis=0)
+
+        pixels = pg.surfarray.pixels2d(self.screen)
+        target = pixels.T[first_row:last_row, :self.width].reshape(last_row - first_row, NUM_RAYS, SCALE)
+        np.copyto(target, wall_pixels, where=on_wall[:, :, None])
+        del target, pixels
@@ -1,4 +1,5 @@
 from sprite_object import *
+from assets import assets
 from collections import deque
 
 
@@ -29,14 +30,18 @@ class Weapon(AnimatedSprite):
             }
         }
 
+        # Weapon switching setup
+        self.weapon_list = ["shotgun", "knife"]  # Order of weapons for cycling
+        self.reset()
+
+    def reset(self):
+        """Refill ammo and go back to the first weapon for a new round."""
         # 🔥 Track current ammo separately
         self.weapon_ammo = {
             "shotgun": self.weapons["shotgun"]["max_ammo"],
             "knife": self.weapons["knife"]["max_ammo"]
         }
 
-        # Weapon switching setup
-        self.weapon_list = ["shotgun", "knife"]  # Order of weapons for cycling
         self.current_weapon_index = 0  # Start with shotgun (index 0)
         self.current_weapon = self.weapon_list[self.current_weapon_index]
         
@@ -110,9 +115,7 @@ class Weapon(AnimatedSprite):
         """Player fires the current weapon."""
         if not self.reloading and self.ammo > 0:
             # Play weapon sound
-            sound = pg.mixer.Sound(self.game.sound.path + self.sound_file)
-            sound.set_volume(0.4)
-            sound.play()
+            assets.sound(self.game.sound.path + self.sound_file).play()
 
             # Start reload animation
             self.reloading = True
@@ -128,9 +131,8 @@ class Weapon(AnimatedSprite):
                 self.toggle_weapon()
         elif self.ammo == 0:
             # 🔥 Optional: Play empty click sound
-            empty_sound = pg.mixer.Sound(self.game.sound.path + "empty_click.wav")
-            empty_sound.set_volume(0.5)
-            empty_sound.play()
+            if self.game.sound.empty_click:
+                self.game.sound.empty_click.play()
 
     def draw(self):
         # Draw weapon sprite